@@ -14,8 +14,12 @@ DATA: 2024
 """
 
 class ModeloPolen:
-    def __init__(self, tipo_planta='graminea'):
+    LIMIARES_ALERTA = np.array([10.0, 50.0, 200.0]) # grãos/m3
+    NIVEIS_ALERTA = np.array(["Baixo", "Médio", "Alto", "Muito Alto (Alérgicos evitar externo)"])
+
+    def __init__(self, tipo_planta='graminea', dtype=np.float32):
         self.tipo = tipo_planta
+        self.dtype = dtype # float32: metade da banda de memória em grades
         # Calendário fenológico simplificado (S. S. Brasil)
         if tipo_planta == 'graminea':
             self.inicio_polinizacao = 270 # Outubro (DOY)
@@ -23,49 +27,61 @@ class ModeloPolen:
         else: # Ambrosia
             self.inicio_polinizacao = 60 # Março
             self.fim_polinizacao = 120 # Abril
+
+        # Perfil gaussiano da estação (pico no meio) - constante por planta
+        self.meio_estacao = (self.inicio_polinizacao + self.fim_polinizacao) / 2
+        duracao = self.fim_polinizacao - self.inicio_polinizacao
+        self.sigma_estacao = duracao / 6
+        # -1/(2*sigma^2): no laço quente a gaussiana vira só multiplicação
+        self._menos_inv_2sigma2 = -1.0 / (2 * self.sigma_estacao**2)
+        # Tabela do fator sazonal indexada pelo próprio DOY (0..366): para dias
+        # inteiros a gaussiana vira uma leitura de memória em vez de um exp.
+        desvio = np.arange(367) - self.meio_estacao
+        self._tabela_sazonal = np.exp(desvio * desvio * self._menos_inv_2sigma2).astype(dtype)
             
     def calcular_liberacao(self, dia_do_ano, temperatura, umidade, velocidade_vento):
         """
         Retorna concentracao potencial (grãos/m3).
+        Aceita escalares ou arrays (séries temporais / grades) com broadcasting.
         """
+        dia_do_ano = np.asarray(dia_do_ano)
+        if np.issubdtype(dia_do_ano.dtype, np.integer):
+            fator_sazonal = self._tabela_sazonal[np.clip(dia_do_ano, 0, 366)]
+        else:
+            desvio = dia_do_ano.astype(self.dtype) - self.meio_estacao
+            fator_sazonal = np.exp(desvio * desvio * self._menos_inv_2sigma2)
+        temperatura = np.asarray(temperatura, dtype=self.dtype)
+        umidade = np.asarray(umidade, dtype=self.dtype)
+        velocidade_vento = np.asarray(velocidade_vento, dtype=self.dtype)
+
         # 1. Checar Janela Fenológica
-        in_season = self.inicio_polinizacao <= dia_do_ano <= self.fim_polinizacao
-        if not in_season:
-            return 0.0
+        in_season = (dia_do_ano >= self.inicio_polinizacao) & (dia_do_ano <= self.fim_polinizacao)
         
         # 2. Modelo de Emissão (Kato et al.)
         # Favorecido por T alta, UR baixa, Vento moderado
         
-        fator_t = max(0, (temperatura - 10) / 20.0) # 30C = 1.0
+        fator_t = np.clip((temperatura - 10) / 20.0, 0, None) # 30C = 1.0
         
-        fator_ur = 0.0
-        if umidade < 60: fator_ur = 1.0
-        elif umidade > 90: fator_ur = 0.1 # Úmido cola o pólen
-        else: fator_ur = 1 - (umidade - 60)/30.0
+        # Úmido (>90%) cola o pólen
+        fator_ur = np.where(umidade < 60, 1.0,
+                            np.where(umidade > 90, 0.1, 1 - (umidade - 60) / 30.0))
         
-        fator_vento = min(1.0, velocidade_vento / 5.0) # Vento ajuda a soltar
+        fator_vento = np.minimum(1.0, velocidade_vento / 5.0) # Vento ajuda a soltar
         
         emissao_base = 500.0 # pico grãos/m3
         
-        # Perfil gaussiano da estação (pico no meio)
-        meio_estacao = (self.inicio_polinizacao + self.fim_polinizacao) / 2
-        duracao = self.fim_polinizacao - self.inicio_polinizacao
-        fator_sazonal = np.exp(-((dia_do_ano - meio_estacao)**2) / (2 * (duracao/6)**2))
-        
         concentracao = emissao_base * fator_sazonal * fator_t * fator_ur * fator_vento
-        return concentracao
+        return np.where(in_season, concentracao, 0.0)
 
     def efeito_chuva(self, concentracao_inicial, chuva_mm):
         """Washout."""
-        if chuva_mm > 5.0: return concentracao_inicial * 0.1 # Limpou tudo
-        if chuva_mm > 1.0: return concentracao_inicial * 0.5
-        return concentracao_inicial
+        chuva_mm = np.asarray(chuva_mm)
+        # > 5 mm limpa quase tudo, > 1 mm remove metade
+        fator = np.select([chuva_mm > 5.0, chuva_mm > 1.0], [0.1, 0.5], default=1.0)
+        return concentracao_inicial * fator
 
     def nivel_alerta(self, concentracao):
-        if concentracao < 10: return "Baixo"
-        if concentracao < 50: return "Médio"
-        if concentracao < 200: return "Alto"
-        return "Muito Alto (Alérgicos evitar externo)"
+        return self.NIVEIS_ALERTA[np.digitize(concentracao, self.LIMIARES_ALERTA)]
 
 # ==============================================================================
 # SELF-TEST
@@ -15,8 +15,9 @@ DATA: 2024
 """
 
 class ModeloCulturas:
-    def __init__(self, cultura='soja'):
+    def __init__(self, cultura='soja', dtype=np.float32):
         self.cultura = cultura
+        self.dtype = dtype # float32: metade da banda de memória em séries longas
         if cultura == 'soja':
             self.t_base = 10.0
             self.t_otima_min = 20.0
@@ -29,20 +30,20 @@ class ModeloCulturas:
             self.t_critica = 30.0 # Choque térmico no enchimento de grãos
 
     def calcular_gdd(self, t_max, t_min):
-        """Growing Degree Days (Graus-Dia)."""
-        t_media = (t_max + t_min) / 2
+        """Growing Degree Days (Graus-Dia). Aceita escalares ou séries diárias."""
+        t_media = 0.5 * (np.asarray(t_max, dtype=self.dtype) + np.asarray(t_min, dtype=self.dtype))
         # Ajuste: se Tmean < Tbase, GDD = 0
-        gdd = max(0, t_media - self.t_base)
-        return gdd
+        return np.maximum(0, t_media - self.t_base)
+
+    def calcular_gdd_acumulado(self, t_max, t_min):
+        """Graus-Dia acumulados ao longo da safra (série diária)."""
+        # Soma acumulada em float64: décadas de dias somados em float32 perdem precisão
+        return np.cumsum(self.calcular_gdd(t_max, t_min), dtype=np.float64)
 
     def verificar_estresse(self, t_max):
         """Retorna intensidade do estresse [0-1]."""
-        if t_max < self.t_critica:
-            return 0.0
-        
-        # Estresse cresce linearmente acima do crítico
-        excess = t_max - self.t_critica
-        return min(1.0, excess / 5.0) # 5 graus acima = 100% dano
+        # Estresse cresce linearmente acima do crítico, 5 graus acima = 100% dano
+        return np.clip((np.asarray(t_max, dtype=self.dtype) - self.t_critica) / 5.0, 0.0, 1.0)
 
 # ==============================================================================
 # SELF-TEST
@@ -18,20 +18,37 @@ DATA: 2024
 """
 
 class ModeloPecuaria:
-    def __init__(self):
-        pass
+    def __init__(self, dtype=np.float32):
+        # float32: ITU difere < 0.01 do cálculo em float64, com metade da banda
+        self.dtype = dtype
         
     def calcular_itu(self, temp_c, hum_rel):
         """Índice de Temperatura e Umidade (Thom, 1959)."""
+        temp_c = np.asarray(temp_c, dtype=self.dtype)
+        hum_rel = np.asarray(hum_rel, dtype=self.dtype)
         itu = 0.8 * temp_c + (hum_rel / 100.0) * (temp_c - 14.4) + 46.4
         return itu
         
     def perda_leite_estimada(self, itu):
         """Estimativa empírica de perda de produção (kg/dia)"""
-        if itu < 72: return 0.0
-        # Perda cresce exponencial
-        perda = 0.2 * (itu - 72) ** 1.5 
-        return perda
+        # Perda cresce exponencial acima de ITU 72 (x**1.5 = x*sqrt(x), sem pow)
+        excesso = np.maximum(0.0, np.asarray(itu, dtype=self.dtype) - 72)
+        return 0.2 * excesso * np.sqrt(excesso)
+
+    def calcular_perda_leite_batch(self, temp_c, hum_rel):
+        """
+        Perda de leite (kg/vaca/dia) direto de temperatura e umidade, em lote.
+        Arrays (N,) de vaca-dia; o ITU não é materializado como array separado:
+        o excesso sobre 72 é montado e recortado no mesmo buffer.
+        """
+        temp_c = np.asarray(temp_c, dtype=self.dtype)
+        ur = np.asarray(hum_rel, dtype=self.dtype) / 100.0
+        # ITU - 72 = (0.8 + UR)*Ta - 14.4*UR + 46.4 - 72
+        excesso = (0.8 + ur) * temp_c
+        excesso -= 14.4 * ur
+        excesso += 46.4 - 72
+        np.maximum(excesso, 0.0, out=excesso)
+        return 0.2 * excesso * np.sqrt(excesso)
 
 # ==============================================================================
 # SELF-TEST
@@ -15,6 +15,12 @@ DATA: 2024
 """
 
 class IndicePET:
+    CLASSES_CONFORTO = np.array([
+        "Estresse Calor Extremo", "Estresse Calor Forte", "Estresse Calor Moderado",
+        "Leve Estresse Calor", "Confortável", "Leve Estresse Frio",
+        "Estresse Frio Moderado", "Estresse Frio Forte", "Estresse Frio Extremo"
+    ])
+
     def __init__(self):
         pass
         
@@ -24,32 +30,24 @@ class IndicePET:
         Baseado em Walther & Matzarakis (2006) ou similar.
         """
         # PET aumenta drasticamente com o sol e diminui com o vento.
+        # Aceita escalares ou arrays (grades/séries) com broadcasting.
+        ta, vapor_pressure_hpa, vento_v12, radiacao_solar = map(
+            np.asarray, (ta, vapor_pressure_hpa, vento_v12, radiacao_solar))
         
-        # 1. Efeito Radiativo (Tmrt)
-        # Aproximadamente: Tmrt sobe 1C a cada ~30 W/m2 absorvido
-        tmrt_proxy = ta + (radiacao_solar * 0.03) 
-        
-        # 2. Correção Vento (reduz sensação em geral, exceto muito quente)
-        # Cooling effect ~ sqrt(v)
-        cooling = -3.0 * (vento_v12 ** 0.5)
-        
-        # 3. Componente Latente (Umidade)
-        # Sensação aumenta com vapor d'água
-        humidity_stress = (vapor_pressure_hpa - 12) * 0.4
-        
-        pet_estimado = ta + (tmrt_proxy - ta)*0.6 + cooling + humidity_stress
-        return pet_estimado
+        # 1. Efeito Radiativo (Tmrt): Tmrt_proxy = Ta + 0.03*Rad, com peso 0.6 no PET
+        #    => (Tmrt_proxy - Ta)*0.6 = 0.018*Rad
+        # 2. Correção Vento (reduz sensação): cooling ~ -3*sqrt(v)
+        # 3. Componente Latente (Umidade): sensação aumenta com vapor d'água
+        return (ta + 0.018 * radiacao_solar
+                - 3.0 * np.sqrt(np.clip(vento_v12, 0, None))
+                + 0.4 * (vapor_pressure_hpa - 12))
 
     def classificar_conforto(self, pet):
-        if pet > 41: return "Estresse Calor Extremo"
-        if pet > 35: return "Estresse Calor Forte"
-        if pet > 29: return "Estresse Calor Moderado"
-        if pet > 23: return "Leve Estresse Calor"
-        if pet >= 18: return "Confortável"
-        if pet >= 13: return "Leve Estresse Frio"
-        if pet >= 8: return "Estresse Frio Moderado"
-        if pet >= 4: return "Estresse Frio Forte"
-        return "Estresse Frio Extremo"
+        pet = np.asarray(pet)
+        # Faixas de calor com limite aberto (>), de frio com limite fechado (>=)
+        condicoes = [pet > 41, pet > 35, pet > 29, pet > 23,
+                     pet >= 18, pet >= 13, pet >= 8, pet >= 4]
+        return np.select(condicoes, self.CLASSES_CONFORTO[:-1], default=self.CLASSES_CONFORTO[-1])
 
 # ==============================================================================
 # SELF-TEST
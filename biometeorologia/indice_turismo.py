@@ -20,57 +20,67 @@ DATA: 2024
 
 class IndiceTurismo:
     def __init__(self):
-        pass
+        # Tabelas de pontuação em degraus (bordas + nota por faixa), avaliadas
+        # com np.searchsorted: uma busca binária por elemento, sem ramificações.
+        
+        # Chuva: menos chuva melhor (faixas [a, b))
+        self._bordas_chuva = np.array([15.0, 30.0, 45.0, 60.0, 90.0, 120.0])
+        self._notas_chuva = np.array([5.0, 4.5, 4.0, 3.0, 2.0, 1.0, 0.0]) # Muita chuva = ruim
+        
+        # Conforto: ideal 20-27C. Bordas 27, 29 e 35 pertencem à faixa de baixo
+        # (limites fechados à direita), deslocadas 1 ulp para usar o mesmo side.
+        self._bordas_conforto = np.array([5.0, 18.0, 20.0,
+                                          np.nextafter(27.0, np.inf),
+                                          np.nextafter(29.0, np.inf),
+                                          np.nextafter(35.0, np.inf)])
+        self._notas_conforto = np.array([1.0, 3.0, 4.5, 5.0, 4.5, 3.0, 1.0])
+        
+        # Vento: leve é bom (<= 6), forte é ruim (> 10)
+        self._bordas_vento = np.array([6.0, 10.0])
+        self._notas_vento = np.array([5.0, 2.0, 0.0])
+        
+        # TCI = 2*(4*CID + 1*CIA + 2*P_Chuva + 2*P_Sol + 1*P_Vento)
+        # (Soma max = 20 + 5 + 10 + 10 + 5 = 50 * 2 = 100)
+        self._pesos_tci = np.array([8.0, 2.0, 4.0, 4.0, 2.0])
+        
+        self._limiares_tci = np.array([40.0, 50.0, 60.0, 70.0, 80.0])
+        self._classes_tci = np.array(["Desfavorável", "Marginal", "Aceitável", "Bom", "Muito Bom", "Excelente"])
         
     def _pontuar_chuva(self, mm_mes):
         """Menos chuva melhor."""
-        if mm_mes < 15: return 5.0
-        if mm_mes < 30: return 4.5
-        if mm_mes < 45: return 4.0
-        if mm_mes < 60: return 3.0
-        if mm_mes < 90: return 2.0
-        if mm_mes < 120: return 1.0
-        return 0.0 # Muita chuva = ruim
+        return self._notas_chuva[np.searchsorted(self._bordas_chuva, mm_mes, side='right')]
 
     def _pontuar_conforto(self, temp_max):
         """Temperatura ideal 20-27C."""
-        if 20 <= temp_max <= 27: return 5.0
-        if 18 <= temp_max < 20 or 27 < temp_max <= 29: return 4.5
-        if temp_max > 35 or temp_max < 5: return 1.0
-        return 3.0
+        return self._notas_conforto[np.searchsorted(self._bordas_conforto, temp_max, side='right')]
+
+    def _pontuar_vento(self, vento_ms):
+        """Vento leve é bom, forte é ruim."""
+        return self._notas_vento[np.searchsorted(self._bordas_vento, vento_ms, side='left')]
+
+    def calcular_subindices(self, t_max_media, t_media, chuva_mm_total, sol_horas_dia, vento_ms):
+        """
+        Sub-índices (0 a 5) empilhados no último eixo: (..., 5) na ordem
+        [CID, CIA, Chuva, Sol, Vento]. Entradas com broadcasting (ex.: (n_estacoes, 12)).
+        """
+        cid = self._pontuar_conforto(t_max_media) # Conforto diurno (40%)
+        cia = self._pontuar_conforto(t_media) # Conforto diario (10%)
+        p_chuva = self._pontuar_chuva(chuva_mm_total) # Chuva (20%)
+        p_sol = np.minimum(5.0, np.asarray(sol_horas_dia) / 2.0) # Sol (20%) - Mais sol melhor, até certo ponto
+        p_vento = self._pontuar_vento(vento_ms) # Vento (10%)
+        return np.stack(np.broadcast_arrays(cid, cia, p_chuva, p_sol, p_vento), axis=-1)
 
     def calcular_tci_mensal(self, t_max_media, t_media, chuva_mm_total, sol_horas_dia, vento_ms):
         """
         Cálculo simplificado do TCI.
-        Retorna Valor TCI e Categoria.
+        Aceita escalares ou arrays (ex.: shape (n_estacoes, 12)).
         """
-        # Sub-indices (0 a 5)
-        cid = self._pontuar_conforto(t_max_media) # Conforto diurno (40%) - peso 2 (escala 10) -> 8 pts max
-        cia = self._pontuar_conforto(t_media) # Conforto diario (10%)
-        
-        # Chuva (20%)
-        p_chuva = self._pontuar_chuva(chuva_mm_total)
-        
-        # Sol (20%) - Mais sol melhor, até certo ponto
-        p_sol = min(5.0, sol_horas_dia / 2.0)
-        
-        # Vento (10%) - Vento leve é bom, forte é ruim
-        p_vento = 5.0
-        if vento_ms > 6: p_vento = 2.0
-        if vento_ms > 10: p_vento = 0.0
-        
-        # Fórmula TCI = 4*CID + 1*CIA + 2*P_Chuva + 2*P_Sol + 1*P_Vento (Soma max = 20 + 5 + 10 + 10 + 5 = 50 * 2 = 100)
-        tci = 2 * (4*cid + 1*cia + 2*p_chuva + 2*p_sol + 1*p_vento)
-        
-        return tci
+        notas = self.calcular_subindices(t_max_media, t_media, chuva_mm_total, sol_horas_dia, vento_ms)
+        # Ponderação de todas as estações/meses num único produto (BLAS)
+        return notas @ self._pesos_tci
 
     def classificar_tci(self, tci):
-        if tci >= 80: return "Excelente"
-        if tci >= 70: return "Muito Bom"
-        if tci >= 60: return "Bom"
-        if tci >= 50: return "Aceitável"
-        if tci >= 40: return "Marginal"
-        return "Desfavorável"
+        return self._classes_tci[np.digitize(tci, self._limiares_tci)]
 
 # ==============================================================================
 # SELF-TEST
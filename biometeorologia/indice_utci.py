@@ -1,5 +1,5 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from nucleo.aceleracao import numexpr, cupy, modulo_array
 
 """
 MÓDULO DE BIOMETEOROLOGIA: ÍNDICE DE CONFORTO TÉRMICO (UTCI)
@@ -20,9 +20,296 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Coeficientes do polinômio de 6ª ordem de Bröde et al. (2012), UTCI_approx.
+# Cada linha: [coeficiente, expoente Ta, expoente va, expoente dTmrt, expoente Pa]
+# Ta em °C, va em m/s (10 m), dTmrt = Tmrt - Ta em °C, Pa em kPa.
+_UTCI_TABELA = np.array([
+    [ 6.07562052e-01, 0, 0, 0, 0],
+    [-2.27712343e-02, 1, 0, 0, 0],
+    [ 8.06470249e-04, 2, 0, 0, 0],
+    [-1.54271372e-04, 3, 0, 0, 0],
+    [-3.24651735e-06, 4, 0, 0, 0],
+    [ 7.32602852e-08, 5, 0, 0, 0],
+    [ 1.35959073e-09, 6, 0, 0, 0],
+    [-2.25836520e+00, 0, 1, 0, 0],
+    [ 8.80326035e-02, 1, 1, 0, 0],
+    [ 2.16844454e-03, 2, 1, 0, 0],
+    [-1.53347087e-05, 3, 1, 0, 0],
+    [-5.72983704e-07, 4, 1, 0, 0],
+    [-2.55090145e-09, 5, 1, 0, 0],
+    [-7.51269505e-01, 0, 2, 0, 0],
+    [-4.08350271e-03, 1, 2, 0, 0],
+    [-5.21670675e-05, 2, 2, 0, 0],
+    [ 1.94544667e-06, 3, 2, 0, 0],
+    [ 1.14099531e-08, 4, 2, 0, 0],
+    [ 1.58137256e-01, 0, 3, 0, 0],
+    [-6.57263143e-05, 1, 3, 0, 0],
+    [ 2.22697524e-07, 2, 3, 0, 0],
+    [-4.16117031e-08, 3, 3, 0, 0],
+    [-1.27762753e-02, 0, 4, 0, 0],
+    [ 9.66891875e-06, 1, 4, 0, 0],
+    [ 2.52785852e-09, 2, 4, 0, 0],
+    [ 4.56306672e-04, 0, 5, 0, 0],
+    [-1.74202546e-07, 1, 5, 0, 0],
+    [-5.91491269e-06, 0, 6, 0, 0],
+    [ 3.98374029e-01, 0, 0, 1, 0],
+    [ 1.83945314e-04, 1, 0, 1, 0],
+    [-1.73754510e-04, 2, 0, 1, 0],
+    [-7.60781159e-07, 3, 0, 1, 0],
+    [ 3.77830287e-08, 4, 0, 1, 0],
+    [ 5.43079673e-10, 5, 0, 1, 0],
+    [-2.00518269e-02, 0, 1, 1, 0],
+    [ 8.92859837e-04, 1, 1, 1, 0],
+    [ 3.45433048e-06, 2, 1, 1, 0],
+    [-3.77925774e-07, 3, 1, 1, 0],
+    [-1.69699377e-09, 4, 1, 1, 0],
+    [ 1.69992415e-04, 0, 2, 1, 0],
+    [-4.99204314e-05, 1, 2, 1, 0],
+    [ 2.47417178e-07, 2, 2, 1, 0],
+    [ 1.07596466e-08, 3, 2, 1, 0],
+    [ 8.49242932e-05, 0, 3, 1, 0],
+    [ 1.35191328e-06, 1, 3, 1, 0],
+    [-6.21531254e-09, 2, 3, 1, 0],
+    [-4.99410301e-06, 0, 4, 1, 0],
+    [-1.89489258e-08, 1, 4, 1, 0],
+    [ 8.15300114e-08, 0, 5, 1, 0],
+    [ 7.55043090e-04, 0, 0, 2, 0],
+    [-5.65095215e-05, 1, 0, 2, 0],
+    [-4.52166564e-07, 2, 0, 2, 0],
+    [ 2.46688878e-08, 3, 0, 2, 0],
+    [ 2.42674348e-10, 4, 0, 2, 0],
+    [ 1.54547250e-04, 0, 1, 2, 0],
+    [ 5.24110970e-06, 1, 1, 2, 0],
+    [-8.75874982e-08, 2, 1, 2, 0],
+    [-1.50743064e-09, 3, 1, 2, 0],
+    [-1.56236307e-05, 0, 2, 2, 0],
+    [-1.33895614e-07, 1, 2, 2, 0],
+    [ 2.49709824e-09, 2, 2, 2, 0],
+    [ 6.51711721e-07, 0, 3, 2, 0],
+    [ 1.94960053e-09, 1, 3, 2, 0],
+    [-1.00361113e-08, 0, 4, 2, 0],
+    [-1.21206673e-05, 0, 0, 3, 0],
+    [-2.18203660e-07, 1, 0, 3, 0],
+    [ 7.51269482e-09, 2, 0, 3, 0],
+    [ 9.79063848e-11, 3, 0, 3, 0],
+    [ 1.25006734e-06, 0, 1, 3, 0],
+    [-1.81584736e-09, 1, 1, 3, 0],
+    [-3.52197671e-10, 2, 1, 3, 0],
+    [-3.36514630e-08, 0, 2, 3, 0],
+    [ 1.35908359e-10, 1, 2, 3, 0],
+    [ 4.17032620e-10, 0, 3, 3, 0],
+    [-1.30369025e-09, 0, 0, 4, 0],
+    [ 4.13908461e-10, 1, 0, 4, 0],
+    [ 9.22652254e-12, 2, 0, 4, 0],
+    [-5.08220384e-09, 0, 1, 4, 0],
+    [-2.24730961e-11, 1, 1, 4, 0],
+    [ 1.17139133e-10, 0, 2, 4, 0],
+    [ 6.62154879e-10, 0, 0, 5, 0],
+    [ 4.03863260e-13, 1, 0, 5, 0],
+    [ 1.95087203e-12, 0, 1, 5, 0],
+    [-4.73602469e-12, 0, 0, 6, 0],
+    [ 5.12733497e+00, 0, 0, 0, 1],
+    [-3.12788561e-01, 1, 0, 0, 1],
+    [-1.96701861e-02, 2, 0, 0, 1],
+    [ 9.99690870e-04, 3, 0, 0, 1],
+    [ 9.51738512e-06, 4, 0, 0, 1],
+    [-4.66426341e-07, 5, 0, 0, 1],
+    [ 5.48050612e-01, 0, 1, 0, 1],
+    [-3.30552823e-03, 1, 1, 0, 1],
+    [-1.64119440e-03, 2, 1, 0, 1],
+    [-5.16670694e-06, 3, 1, 0, 1],
+    [ 9.52692432e-07, 4, 1, 0, 1],
+    [-4.29223622e-02, 0, 2, 0, 1],
+    [ 5.00845667e-03, 1, 2, 0, 1],
+    [ 1.00601257e-06, 2, 2, 0, 1],
+    [-1.81748644e-06, 3, 2, 0, 1],
+    [-1.25813502e-03, 0, 3, 0, 1],
+    [-1.79330391e-04, 1, 3, 0, 1],
+    [ 2.34994441e-06, 2, 3, 0, 1],
+    [ 1.29735808e-04, 0, 4, 0, 1],
+    [ 1.29064870e-06, 1, 4, 0, 1],
+    [-2.28558686e-06, 0, 5, 0, 1],
+    [-3.69476348e-02, 0, 0, 1, 1],
+    [ 1.62325322e-03, 1, 0, 1, 1],
+    [-3.14279680e-05, 2, 0, 1, 1],
+    [ 2.59835559e-06, 3, 0, 1, 1],
+    [-4.77136523e-08, 4, 0, 1, 1],
+    [ 8.64203390e-03, 0, 1, 1, 1],
+    [-6.87405181e-04, 1, 1, 1, 1],
+    [-9.13863872e-06, 2, 1, 1, 1],
+    [ 5.15916806e-07, 3, 1, 1, 1],
+    [-3.59217476e-05, 0, 2, 1, 1],
+    [ 3.28696511e-05, 1, 2, 1, 1],
+    [-7.10542454e-07, 2, 2, 1, 1],
+    [-1.24382300e-05, 0, 3, 1, 1],
+    [-7.38584400e-09, 1, 3, 1, 1],
+    [ 2.20609296e-07, 0, 4, 1, 1],
+    [-7.32469180e-04, 0, 0, 2, 1],
+    [-1.87381964e-05, 1, 0, 2, 1],
+    [ 4.80925239e-06, 2, 0, 2, 1],
+    [-8.75492040e-08, 3, 0, 2, 1],
+    [ 2.77862930e-05, 0, 1, 2, 1],
+    [-5.06004592e-06, 1, 1, 2, 1],
+    [ 1.14325367e-07, 2, 1, 2, 1],
+    [ 2.53016723e-06, 0, 2, 2, 1],
+    [-1.72857035e-08, 1, 2, 2, 1],
+    [-3.95079398e-08, 0, 3, 2, 1],
+    [-3.59413173e-07, 0, 0, 3, 1],
+    [ 7.04388046e-07, 1, 0, 3, 1],
+    [-1.89309167e-08, 2, 0, 3, 1],
+    [-4.79768731e-07, 0, 1, 3, 1],
+    [ 7.96079978e-09, 1, 1, 3, 1],
+    [ 1.62897058e-09, 0, 2, 3, 1],
+    [ 3.94367674e-08, 0, 0, 4, 1],
+    [-1.18566247e-09, 1, 0, 4, 1],
+    [ 3.34678041e-10, 0, 1, 4, 1],
+    [-1.15606447e-10, 0, 0, 5, 1],
+    [-2.80626406e+00, 0, 0, 0, 2],
+    [ 5.48712484e-01, 1, 0, 0, 2],
+    [-3.99428410e-03, 2, 0, 0, 2],
+    [-9.54009191e-04, 3, 0, 0, 2],
+    [ 1.93090978e-05, 4, 0, 0, 2],
+    [-3.08806365e-01, 0, 1, 0, 2],
+    [ 1.16952364e-02, 1, 1, 0, 2],
+    [ 4.95271903e-04, 2, 1, 0, 2],
+    [-1.90710882e-05, 3, 1, 0, 2],
+    [ 2.10787756e-03, 0, 2, 0, 2],
+    [-6.98445738e-04, 1, 2, 0, 2],
+    [ 2.30109073e-05, 2, 2, 0, 2],
+    [ 4.17856590e-04, 0, 3, 0, 2],
+    [-1.27043871e-05, 1, 3, 0, 2],
+    [-3.04620472e-06, 0, 4, 0, 2],
+    [ 5.14507424e-02, 0, 0, 1, 2],
+    [-4.32510997e-03, 1, 0, 1, 2],
+    [ 8.99281156e-05, 2, 0, 1, 2],
+    [-7.14663943e-07, 3, 0, 1, 2],
+    [-2.66016305e-04, 0, 1, 1, 2],
+    [ 2.63789586e-04, 1, 1, 1, 2],
+    [-7.01199003e-06, 2, 1, 1, 2],
+    [-1.06823306e-04, 0, 2, 1, 2],
+    [ 3.61341136e-06, 1, 2, 1, 2],
+    [ 2.29748967e-07, 0, 3, 1, 2],
+    [ 3.04788893e-04, 0, 0, 2, 2],
+    [-6.42070836e-05, 1, 0, 2, 2],
+    [ 1.16257971e-06, 2, 0, 2, 2],
+    [ 7.68023384e-06, 0, 1, 2, 2],
+    [-5.47446896e-07, 1, 1, 2, 2],
+    [-3.59937910e-08, 0, 2, 2, 2],
+    [-4.36497725e-06, 0, 0, 3, 2],
+    [ 1.68737969e-07, 1, 0, 3, 2],
+    [ 2.67489271e-08, 0, 1, 3, 2],
+    [ 3.23926897e-09, 0, 0, 4, 2],
+    [-3.53874123e-02, 0, 0, 0, 3],
+    [-2.21201190e-01, 1, 0, 0, 3],
+    [ 1.55126038e-02, 2, 0, 0, 3],
+    [-2.63917279e-04, 3, 0, 0, 3],
+    [ 4.53433455e-02, 0, 1, 0, 3],
+    [-4.32943862e-03, 1, 1, 0, 3],
+    [ 1.45389826e-04, 2, 1, 0, 3],
+    [ 2.17508610e-04, 0, 2, 0, 3],
+    [-6.66724702e-05, 1, 2, 0, 3],
+    [ 3.33217140e-05, 0, 3, 0, 3],
+    [-2.26921615e-03, 0, 0, 1, 3],
+    [ 3.80261982e-04, 1, 0, 1, 3],
+    [-5.45314314e-09, 2, 0, 1, 3],
+    [-7.96355448e-04, 0, 1, 1, 3],
+    [ 2.53458034e-05, 1, 1, 1, 3],
+    [-6.31223658e-06, 0, 2, 1, 3],
+    [ 3.02122035e-04, 0, 0, 2, 3],
+    [-4.77403547e-06, 1, 0, 2, 3],
+    [ 1.73825715e-06, 0, 1, 2, 3],
+    [-4.09087898e-07, 0, 0, 3, 3],
+    [ 6.14155345e-01, 0, 0, 0, 4],
+    [-6.16755931e-02, 1, 0, 0, 4],
+    [ 1.33374846e-03, 2, 0, 0, 4],
+    [ 3.55375387e-03, 0, 1, 0, 4],
+    [-5.13027851e-04, 1, 1, 0, 4],
+    [ 1.02449757e-04, 0, 2, 0, 4],
+    [-1.48526421e-03, 0, 0, 1, 4],
+    [-4.11469183e-05, 1, 0, 1, 4],
+    [-6.80434415e-06, 0, 1, 1, 4],
+    [-9.77675906e-06, 0, 0, 2, 4],
+    [ 8.82773108e-02, 0, 0, 0, 5],
+    [-3.01859306e-03, 1, 0, 0, 5],
+    [ 1.04452989e-03, 0, 1, 0, 5],
+    [ 2.47090539e-04, 0, 0, 1, 5],
+    [ 1.48348065e-03, 0, 0, 0, 6],
+])
+_UTCI_COEF = np.ascontiguousarray(_UTCI_TABELA[:, 0])
+_UTCI_EXPOENTES = _UTCI_TABELA[:, 1:].astype(np.int8)
+_UTCI_GRAU_MAX = 6
+
+def _tabela_potencias(x):
+    """Empilha x**0 .. x**6 (multiplicações sucessivas, sem pow)."""
+    potencias = np.empty((_UTCI_GRAU_MAX + 1,) + x.shape, dtype=x.dtype)
+    potencias[0] = 1.0
+    for k in range(1, _UTCI_GRAU_MAX + 1):
+        potencias[k] = potencias[k - 1] * x
+    return potencias
+
+def _agrupar_por_pa(coef, expoentes):
+    """
+    Agrupa os monômios pela potência de Pa: {k: [(c, e_ta, e_va, e_dt), ...]},
+    de modo que UTCI = Ta + sum_k Pa^k * G_k(Ta, va, dTmrt) (Horner em Pa).
+    """
+    grupos = {}
+    for c, e in zip(coef, expoentes):
+        grupos.setdefault(int(e[3]), []).append((c, int(e[0]), int(e[1]), int(e[2])))
+    return grupos
+
+def _expressoes_numexpr(coef, expoentes):
+    """
+    Escreve o polinômio para o numexpr como UTCI = Ta + sum_k Pa^k * G_k(Ta, va, dTmrt).
+    O compilador do numexpr tem no máximo 256 registradores, então os 210 monômios
+    são agrupados por potência de Pa (cada G_k vira uma expressão) e combinados em Horner.
+    """
+    grupos = {k: ['*'.join([repr(float(c))] + ['ta'] * a + ['va'] * b + ['dt'] * d)
+                  for c, a, b, d in monomios]
+              for k, monomios in _agrupar_por_pa(coef, expoentes).items()}
+    
+    grau = max(grupos)
+    horner = f'g{grau}'
+    for k in range(grau - 1, -1, -1):
+        horner = f'g{k} + pa*({horner})' if k in grupos else f'pa*({horner})'
+    return {f'g{k}': ' + '.join(termos) for k, termos in grupos.items()}, 'ta + ' + horner
+
+def _fonte_kernel_gpu(coef, expoentes):
+    """Corpo C do kernel elementwise CuPy: potências em registradores + somatório FMA."""
+    linhas = ['T p_ta[7], p_va[7], p_dt[7], p_pa[7];',
+              'p_ta[0] = p_va[0] = p_dt[0] = p_pa[0] = 1;',
+              'for (int k = 1; k < 7; k++) {',
+              '    p_ta[k] = p_ta[k-1] * ta; p_va[k] = p_va[k-1] * va;',
+              '    p_dt[k] = p_dt[k-1] * dt; p_pa[k] = p_pa[k-1] * pa;',
+              '}',
+              'T soma = ta;']
+    for c, e in zip(coef, expoentes):
+        linhas.append(f'soma += (T){float(c)!r} * p_ta[{e[0]}] * p_va[{e[1]}] * p_dt[{e[2]}] * p_pa[{e[3]}];')
+    linhas.append('utci = soma;')
+    return '\n'.join(linhas)
+
 class IndiceConfortoUTCI:
-    def __init__(self):
-        pass
+    # Acima deste nº de pontos o polinômio é avaliado pelo numexpr (se instalado),
+    # que processa em blocos que cabem no cache e usa todos os núcleos.
+    LIMIAR_NUMEXPR = 100_000
+
+    def __init__(self, dtype=np.float32, especializar_para=None):
+        # float32: UTCI difere no máximo ~0.01°C do float64 na faixa de validade
+        self.dtype = dtype
+        self.especializar_para = especializar_para
+        
+        termos = np.ones(len(_UTCI_COEF), dtype=bool)
+        if especializar_para == 'sombra':
+            # Sombra/interior: Tmrt = Ta (dTmrt = 0), todo monômio com dTmrt^k (k >= 1)
+            # se anula. O polinômio é reduzido uma vez aqui: 84 termos em vez de 210.
+            termos = _UTCI_EXPOENTES[:, 2] == 0
+        elif especializar_para is not None:
+            raise ValueError(f"Regime de especialização desconhecido: {especializar_para}")
+        
+        self.coef = _UTCI_COEF[termos].astype(dtype)
+        self.expoentes = _UTCI_EXPOENTES[termos]
+        self.grupos_pa = _agrupar_por_pa(self.coef, self.expoentes)
+        self.expressoes_grupos, self.expressao_horner = _expressoes_numexpr(self.coef, self.expoentes)
+        self._kernel_gpu = None # compilado na primeira chamada com arrays CuPy
         
     def estimar_tmrt_simplificado(self, temp_ar, radiacao_solar):
         """
@@ -34,50 +321,88 @@ class IndiceConfortoUTCI:
         # Tmrt aumenta ~0.03 graus por W/m2 absorvido
         return temp_ar + (radiacao_solar * 0.02) 
 
+    def _usar_numexpr(self, x):
+        return numexpr is not None and x.size >= self.LIMIAR_NUMEXPR and isinstance(x, np.ndarray)
+
+    def _avaliar_polinomio_gpu(self, ta, va, d_tmrt, pa):
+        """Polinômio inteiro num único kernel CUDA (um thread por ponto de grade)."""
+        if self._kernel_gpu is None:
+            self._kernel_gpu = cupy.ElementwiseKernel(
+                'T ta, T va, T dt, T pa', 'T utci',
+                _fonte_kernel_gpu(self.coef, self.expoentes), 'utci_brode')
+        return self._kernel_gpu(ta, va, d_tmrt, pa)
+
+    def _avaliar_polinomio(self, ta, va, d_tmrt, pa):
+        """Avalia o polinômio sobre entradas já limitadas e com mesmo shape (pa em kPa)."""
+        if modulo_array(ta) is not np:
+            return self._avaliar_polinomio_gpu(ta, va, d_tmrt, pa)
+        if self._usar_numexpr(ta):
+            variaveis = {'ta': ta, 'va': va, 'dt': d_tmrt, 'pa': pa}
+            for nome, expressao in self.expressoes_grupos.items():
+                variaveis[nome] = numexpr.evaluate(expressao, local_dict=variaveis)
+            utci_est = numexpr.evaluate(self.expressao_horner, local_dict=variaveis)
+            return utci_est.astype(self.dtype, copy=False)
+        
+        # Mesma forma de Horner em Pa do numexpr, acumulada termo a termo:
+        # potências 0..6 de Ta, va e dTmrt calculadas uma única vez e só
+        # buffers do tamanho da grade (nunca a matriz 210 x N de monômios).
+        p_ta, p_va, p_dt = _tabela_potencias(ta), _tabela_potencias(va), _tabela_potencias(d_tmrt)
+        termo = np.empty_like(ta)
+        utci_est = None
+        for k in range(max(self.grupos_pa), -1, -1):
+            g_k = np.zeros_like(ta)
+            for c, a, b, d in self.grupos_pa.get(k, ()):
+                np.multiply(p_ta[a], p_va[b], out=termo)
+                if d:
+                    termo *= p_dt[d]
+                termo *= c
+                g_k += termo
+            if utci_est is None:
+                utci_est = g_k
+            else:
+                utci_est *= pa
+                utci_est += g_k
+        
+        return ta + utci_est
+
     def calcular_utci(self, ta, variacao_vento_v10, pressao_vapor_hpa, tmrt_delta):
         """
         Aproximação Polinomial Oficial do UTCI (Bröde et al., 2012).
-        Inputs:
+        Inputs (escalares ou arrays com broadcasting):
             ta: Temp Ar (°C)
             va: Velocidade Vento (m/s)
             pa: Pressão Vapor (hPa) -- convertida de UR se preciso
-            tmrt_delta: Tmrt - Ta (°C)
+            tmrt_delta: Tmrt - Ta (°C) -- ignorado (= 0) se especializado para 'sombra'
         """
         # Clampar limites de validade do modelo regressivo
-        ta = np.clip(ta, -50, 50)
-        va = np.clip(variacao_vento_v10, 0.5, 30) # Vento não pode ser 0 na formula
-        
-        # O polinômio completo tem dezenas de coeficientes.
-        # Aqui usaremos uma versão reduzida/simplificada para demonstração 
-        # que captura a sensibilidade principal.
-        
-        # UTCI approx = Ta + Offset(Vento, Umidade, Radiação)
-        
-        # Efeito do Vento (Esfria se Ta < 30, Esquenta se Ta muito alta - "forno")
-        # Mas no geral, vento esfria.
-        # Efeito Radiativo (Tmrt > Ta esquenta)
-        # Efeito Umidade (Aumenta stress no calor)
-        
-        # Termo base
-        utci = ta
-        
-        # Correção Vento (Cooling Power)
-        # Se Ta < 25, vento reduz sensação.
-        # Delta ~ -2 * sqrt(v)
-        cooling = -2.0 * np.sqrt(va) * (1 - (ta/35.0)) # Efeito diminui se Ta sobe
-        
-        # Correção Radiação
-        # Aumenta linearmente com Delta Tmrt
-        radiant = 0.25 * tmrt_delta
+        # (arrays CuPy ficam na GPU: xp é numpy ou cupy conforme a entrada)
+        xp = modulo_array(ta, variacao_vento_v10, pressao_vapor_hpa, tmrt_delta)
+        ta = xp.clip(xp.asarray(ta, dtype=self.dtype), -50, 50)
+        va = xp.clip(xp.asarray(variacao_vento_v10, dtype=self.dtype), 0.5, 17) # Vento não pode ser 0 na formula
+        d_tmrt = xp.clip(xp.asarray(tmrt_delta, dtype=self.dtype), -30, 70)
+        pa = xp.asarray(pressao_vapor_hpa, dtype=self.dtype) / 10.0 # hPa -> kPa
+        return self._avaliar_polinomio(*xp.broadcast_arrays(ta, va, d_tmrt, pa))
+
+    def calcular_utci_from_meteo(self, ta, v10, umidade_relativa, radiacao_solar):
+        """
+        UTCI direto das variáveis de estação (Ta °C, vento m/s, UR %, radiação W/m2).
+        Pressão de vapor (Tetens) e Tmrt (estimar_tmrt_simplificado) entram na mesma
+        passada, sem arrays intermediários de Tmrt/e entre chamadas.
+        """
+        xp = modulo_array(ta, v10, umidade_relativa, radiacao_solar)
+        ta = xp.clip(xp.asarray(ta, dtype=self.dtype), -50, 50)
+        va = xp.clip(xp.asarray(v10, dtype=self.dtype), 0.5, 17)
+        ur = xp.asarray(umidade_relativa, dtype=self.dtype)
+        d_tmrt = xp.clip(0.02 * xp.asarray(radiacao_solar, dtype=self.dtype), -30, 70)
+        ta, va, ur, d_tmrt = xp.broadcast_arrays(ta, va, ur, d_tmrt)
         
-        # Correção Umidade
-        # Pressão vapor alta aumenta sensação apenas no calor
-        humidity = 0.0
-        if ta > 25:
-             humidity = (pressao_vapor_hpa - 20) * 0.1
-             
-        utci_est = utci + cooling + radiant + humidity
-        return utci_est
+        # Pa (kPa) = 6.112 hPa * exp(17.67 Ta / (Ta + 243.5)) * UR/100 / 10
+        if self._usar_numexpr(ta):
+            pa = numexpr.evaluate('0.006112 * exp(17.67 * ta / (ta + 243.5)) * ur',
+                                  local_dict={'ta': ta, 'ur': ur}).astype(self.dtype, copy=False)
+        else:
+            pa = 0.006112 * xp.exp(17.67 * ta / (ta + 243.5)) * ur
+        return self._avaliar_polinomio(ta, va, d_tmrt, pa)
 
     def classificar_estresse(self, utci_val):
         """Retorna categoria de estresse térmico."""
@@ -95,6 +420,8 @@ class IndiceConfortoUTCI:
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Testando Cálculo de UTCI...")
     
     modelo = IndiceConfortoUTCI()
@@ -105,23 +432,20 @@ if __name__ == "__main__":
     vento = 2.0 # m/s
     sol = 800.0 # W/m2
     
-    # Pressão de vapor saturação (Tetens)
-    es = 6.112 * np.exp(17.67 * ta / (ta + 243.5))
-    e_vapor = es * (ur / 100.0)
-    
-    tmrt = modelo.estimar_tmrt_simplificado(ta, sol)
-    tmrt_delta = tmrt - ta
-    
-    utci = modelo.calcular_utci(ta, vento, e_vapor, tmrt_delta)
+    utci = modelo.calcular_utci_from_meteo(ta, vento, ur, sol)
     cat = modelo.classificar_estresse(utci)
     
+    # Pressão de vapor (Tetens) e delta Tmrt para a curva de sensibilidade
+    e_vapor = 6.112 * np.exp(17.67 * ta / (ta + 243.5)) * (ur / 100.0)
+    tmrt_delta = modelo.estimar_tmrt_simplificado(ta, sol) - ta
+    
     print(f"Condições: Ta={ta}C, UR={ur}%, V={vento}m/s, Sol={sol}W/m2")
     print(f"UTCI Estimado: {utci:.1f}°C")
     print(f"Classificação: {cat}")
     
     # Plot sensibilidade ao vento
     ventos = np.linspace(0.5, 15, 50)
-    utcis = [modelo.calcular_utci(ta, v, e_vapor, tmrt_delta) for v in ventos]
+    utcis = modelo.calcular_utci(ta, ventos, e_vapor, tmrt_delta)
     
     plt.figure(figsize=(8, 5))
     plt.plot(ventos, utcis)
@@ -14,26 +14,27 @@ DATA: 2024
 """
 
 class IndiceUV:
-    def __init__(self):
-        pass
+    def __init__(self, dtype=np.float32):
+        self.dtype = dtype # float32: IUV precisa de 1 casa decimal
         
     def calcular_iuv_ceu_claro(self, elevacao_solar_graus, ozonio_dobson=300):
         """
         Modelo simples baseado no ângulo zenital.
+        Aceita perfis (T,) de elevação solar e retorna o IUV (T,).
         """
-        if elevacao_solar_graus <= 0: return 0.0
+        elevacao_solar_graus = np.asarray(elevacao_solar_graus, dtype=self.dtype)
         
-        zenite = 90 - elevacao_solar_graus
-        cos_z = np.cos(np.radians(zenite))
+        # cos(zênite) = sen(elevação); sol abaixo do horizonte -> 0
+        cos_z = np.maximum(np.sin(np.radians(elevacao_solar_graus)), 0.0)
         
         # Modelo aproximado
         # IUV0 ~ 12.5 * (cos_z)^2.42
-        iuv_clear = 12.5 * (cos_z ** 2.42)
+        iuv_clear = 12.5 * np.power(cos_z, 2.42)
         
         # Correção Ozonio (RAF ~ 1.2) - Cada 1% menos ozonio, UV aumenta 1.2%
-        fator_ozonio = (300 / ozonio_dobson) ** 1.2
+        fator_ozonio = np.power(300 / np.asarray(ozonio_dobson, dtype=self.dtype), 1.2)
         
-        return iuv_clear * fator_ozonio
+        return np.where(elevacao_solar_graus > 0, iuv_clear * fator_ozonio, 0.0)
 
     def corrigir_nuvens(self, iuv_claro, cobertura_nuvens_octas):
         """
@@ -41,8 +42,8 @@ class IndiceUV:
         0 octas (claro) -> 100%
         8 octas (coberto) -> ~30%
         """
-        fator = 1.0 - 0.09 * cobertura_nuvens_octas
-        return iuv_claro * max(0.2, fator)
+        fator = 1.0 - 0.09 * np.asarray(cobertura_nuvens_octas, dtype=self.dtype)
+        return iuv_claro * np.maximum(0.2, fator)
 
 # ==============================================================================
 # SELF-TEST
@@ -21,31 +21,25 @@ class ModeloMortalidade:
         """
         Calcula Risco Relativo (RR). RR=1.0 é o basal.
         Baseado em curvas epidemiológicas generalizadas.
+        Forma sem ramificações: aceita séries/painéis de qualquer shape.
         """
-        rr = 1.0
+        temperatura_media = np.asarray(temperatura_media, dtype=float)
+        calor = np.maximum(0.0, temperatura_media - self.mmt)
+        frio = np.maximum(0.0, self.mmt - temperatura_media)
         
         # Calor: Aumento ~3% por grau acima do limiar
-        if temperatura_media > self.mmt:
-            dif = temperatura_media - self.mmt
-            rr = 1.0 + 0.03 * dif
-            # Exponencial em extremos
-            if dif > 8: rr *= 1.2 # Onda calor severa acelera risco
-            
         # Frio: Aumento ~1.5% por grau abaixo (efeito mais lento mas persistente)
-        elif temperatura_media < self.mmt:
-            dif = self.mmt - temperatura_media
-            rr = 1.0 + 0.015 * dif
-            
+        rr = 1.0 + 0.03 * calor + 0.015 * frio
+        # Exponencial em extremos: onda de calor severa (> 8 graus) acelera risco
+        rr *= np.where(calor > 8, 1.2, 1.0)
         return rr
 
     def estimar_excesso_obitos(self, populacao, taxa_base_diaria_por_100k, rr):
         """
         Retorna número estimado de óbitos extras atribuíveis ao clima.
         """
-        obitos_base = (populacao / 100000.0) * taxa_base_diaria_por_100k
-        obitos_cenario = obitos_base * rr
-        excesso = obitos_cenario - obitos_base
-        return excesso
+        # base*RR - base = base*(RR - 1)
+        return (populacao / 100000.0) * taxa_base_diaria_por_100k * (np.asarray(rr) - 1.0)
 
 # ==============================================================================
 # SELF-TEST
@@ -1,4 +1,5 @@
 import numpy as np
+from nucleo.aceleracao import njit, prange
 
 """
 MÓDULO DE BIOMETEOROLOGIA E SEGURANÇA: RISCO DE INCÊNDIO FLORESTAL (FMA)
@@ -13,7 +14,55 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@njit(cache=True)
+def _passo_fma(fma_acum, ur_13h, chuva_mm):
+    """Recorrência diária da FMA: soma H e aplica redução pela chuva."""
+    # Calcular H (Índice diário base)
+    if ur_13h < 25: h = 100 - 2.5 * ur_13h # Muito seco
+    elif ur_13h < 45: h = 87 - 2 * ur_13h
+    else: h = 47 - ur_13h
+    if h < 0: h = 0.0 # Umidade alta não soma risco
+    
+    # Atualizar acumulado
+    fma_acum += h
+    
+    # Redução pela chuva
+    if chuva_mm >= 2.0:
+        if chuva_mm < 5.0: fma_acum *= 0.7
+        elif chuva_mm < 10.0: fma_acum *= 0.4
+        elif chuva_mm < 20.0: fma_acum *= 0.2
+        else: fma_acum = 0.0 # Zerou risco
+    return fma_acum
+
+@njit(cache=True)
+def _serie_fma(ur_13h, chuva_mm, fma_inicial):
+    """Aplica a recorrência dia a dia sobre séries inteiras (laço compilado)."""
+    serie = np.empty(ur_13h.shape[0])
+    fma_acum = fma_inicial
+    for i in range(ur_13h.shape[0]):
+        fma_acum = _passo_fma(fma_acum, ur_13h[i], chuva_mm[i])
+        serie[i] = fma_acum
+    return serie
+
+@njit(parallel=True, cache=True)
+def _grade_fma(ur_13h, chuva_mm, fma_inicial):
+    """
+    FMA para uma rede de estações (N_estacoes, N_dias). A recorrência é serial
+    no tempo, mas as estações são independentes: uma thread por bloco de estações.
+    """
+    n_estacoes, n_dias = ur_13h.shape
+    grade = np.empty((n_estacoes, n_dias))
+    for s in prange(n_estacoes):
+        fma_acum = fma_inicial[s]
+        for i in range(n_dias):
+            fma_acum = _passo_fma(fma_acum, ur_13h[s, i], chuva_mm[s, i])
+            grade[s, i] = fma_acum
+    return grade
+
 class FormulaMonteAlegre:
+    LIMIARES_RISCO = np.array([2.0, 4.0, 8.0, 15.0])
+    CLASSES_RISCO = np.array(["Nulo", "Pequeno", "Médio", "Alto", "Muito Alto"])
+
     def __init__(self):
         self.fma_acum = 0.0
         
@@ -22,31 +71,35 @@ class FormulaMonteAlegre:
         Calcula FMA do dia.
         UR em %.
         """
-        # Calcular H (Índice diário base)
-        h = 0.0
-        if ur_13h < 25: h = 100 - 2.5 * ur_13h # Muito seco
-        elif ur_13h < 45: h = 87 - 2 * ur_13h
-        else: h = 47 - ur_13h
-        if h < 0: h = 0 # Umidade alta não soma risco
-        
-        # Atualizar acumulado
-        self.fma_acum += h
-        
-        # Redução pela chuva
-        if chuva_mm >= 2.0:
-            if chuva_mm < 5.0: self.fma_acum *= 0.7
-            elif chuva_mm < 10.0: self.fma_acum *= 0.4
-            elif chuva_mm < 20.0: self.fma_acum *= 0.2
-            else: self.fma_acum = 0.0 # Zerou risco
-            
+        self.fma_acum = _passo_fma(float(self.fma_acum), float(ur_13h), float(chuva_mm))
         return self.fma_acum
+
+    def simular_serie(self, ur_13h, chuva_mm):
+        """
+        Calcula a FMA para uma série diária completa (UR 13h e chuva).
+        Continua a partir do acumulado atual e retorna a série de FMA.
+        """
+        ur_13h = np.ascontiguousarray(ur_13h, dtype=np.float64)
+        chuva_mm = np.ascontiguousarray(chuva_mm, dtype=np.float64)
+        serie = _serie_fma(ur_13h, chuva_mm, float(self.fma_acum))
+        if len(serie):
+            self.fma_acum = serie[-1]
+        return serie
         
+    def simular_rede_estacoes(self, ur_13h, chuva_mm, fma_inicial=0.0):
+        """
+        Calcula a FMA de várias estações de uma vez.
+        ur_13h, chuva_mm: arrays (N_estacoes, N_dias). fma_inicial: escalar ou (N_estacoes,).
+        Retorna a grade (N_estacoes, N_dias); o acumulado da instância não é alterado.
+        """
+        ur_13h = np.ascontiguousarray(ur_13h, dtype=np.float64)
+        chuva_mm = np.ascontiguousarray(chuva_mm, dtype=np.float64)
+        fma_inicial = np.ascontiguousarray(np.broadcast_to(fma_inicial, ur_13h.shape[:1]), dtype=np.float64)
+        return _grade_fma(ur_13h, chuva_mm, fma_inicial)
+
     def classificar(self, fma):
-        if fma <= 2.0: return "Nulo"
-        if fma <= 4.0: return "Pequeno"
-        if fma <= 8.0: return "Médio"
-        if fma <= 15.0: return "Alto"
-        return "Muito Alto"
+        # Limites superiores inclusivos (FMA <= limiar)
+        return self.CLASSES_RISCO[np.digitize(fma, self.LIMIARES_RISCO, right=True)]
 
 # ==============================================================================
 # SELF-TEST
@@ -56,6 +109,13 @@ if __name__ == "__main__":
     fma = FormulaMonteAlegre()
     
     # 5 dias secos (UR 30%)
-    for i in range(5):
-        val = fma.passo_diario(30, 0)
+    serie = fma.simular_serie(np.full(5, 30.0), np.zeros(5))
+    for i, val in enumerate(serie):
         print(f"Dia {i+1}: FMA={val:.1f} ({fma.classificar(val)})")
+        
+    # Rede de estações: 1000 estações x 1 ano
+    rng = np.random.default_rng(0)
+    ur_rede = rng.uniform(15, 95, (1000, 365))
+    chuva_rede = rng.exponential(3.0, (1000, 365))
+    grade = fma.simular_rede_estacoes(ur_rede, chuva_rede)
+    print(f"Rede {grade.shape}: FMA média final = {grade[:, -1].mean():.1f}")
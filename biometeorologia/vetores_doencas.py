@@ -1,5 +1,5 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from nucleo.aceleracao import numexpr
 
 """
 MÓDULO DE BIOMETEOROLOGIA: VETORES DE DOENÇAS (AEDES AEGYPTI)
@@ -18,20 +18,24 @@ DATA: 2024
 """
 
 class ModeloRiscoDengue:
-    def __init__(self):
-        pass
+    # Acima deste nº de células a expressão completa é avaliada pelo numexpr
+    # (se instalado): fundida, em blocos no cache e em todos os núcleos.
+    LIMIAR_NUMEXPR = 100_000
+    EXPRESSAO_RISCO = ("where((T < 15) | (T > 40), 0, exp(-((T - 29)**2) / 50))"
+                       " * (1 - exp(-0.03 * C)) * 100")
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = dtype # float32: metade da banda de memória em grades
         
     def _taxa_desenvolvimento(self, temperatura):
         """
         Curva de performance térmica para o mosquito.
         Otimiza em ~28-30°C. Morre abaixo de 15°C e acima de 40°C.
         """
-        if temperatura < 15 or temperatura > 40:
-            return 0.0
-        
+        temperatura = np.asarray(temperatura, dtype=self.dtype)
         # Gaussiana centrada em 29°C
         taxa = np.exp(-((temperatura - 29)**2) / (2 * 5**2))
-        return taxa
+        return np.where((temperatura < 15) | (temperatura > 40), 0.0, taxa)
 
     def _fator_agua(self, chuva_acumulada_15dias):
         """
@@ -42,19 +46,48 @@ class ModeloRiscoDengue:
         # 0mm -> 0
         # 50mm -> 0.8
         # >100mm -> 1.0 (mas com risco de washout se muito intenfo, ignorado aqui)
-        return 1 - np.exp(-0.03 * chuva_acumulada_15dias)
+        return 1 - np.exp(-0.03 * np.asarray(chuva_acumulada_15dias, dtype=self.dtype))
 
     def calcular_indice_risco(self, t_media, chuva_15d):
         """
         Retorna Índice de Risco (0 a 1).
         Combinacao multiplicativa (ambas condições necessárias).
+        Aceita escalares ou grades/séries (broadcasting).
         """
+        t_media, chuva_15d = np.broadcast_arrays(np.asarray(t_media, dtype=self.dtype),
+                                                 np.asarray(chuva_15d, dtype=self.dtype))
+        if numexpr is not None and t_media.size >= self.LIMIAR_NUMEXPR:
+            risco = numexpr.evaluate(self.EXPRESSAO_RISCO, local_dict={'T': t_media, 'C': chuva_15d})
+            return risco.astype(self.dtype, copy=False)
+        
         f_temp = self._taxa_desenvolvimento(t_media)
         f_agua = self._fator_agua(chuva_15d)
         
         risco = f_temp * f_agua * 100 # Escala 0-100
         return risco
 
+    def calcular_serie_risco(self, t_diaria, chuva_diaria, janela_dias=15):
+        """
+        Série diária de risco a partir de temperatura média e chuva diárias.
+        A chuva acumulada é a soma móvel dos últimos `janela_dias` dias (inclusive
+        o dia corrente; os primeiros dias usam a janela parcial disponível).
+        Aceita arrays, pandas.Series ou xarray.DataArray e devolve o mesmo tipo.
+        """
+        t = np.asarray(t_diaria, dtype=self.dtype)
+        chuva = np.asarray(chuva_diaria, dtype=self.dtype)
+        
+        # Soma móvel retroativa: convolução completa truncada em N (só dias passados)
+        chuva_acum = np.convolve(chuva, np.ones(janela_dias, dtype=self.dtype))[:len(chuva)]
+        risco = self.calcular_indice_risco(t, chuva_acum)
+        
+        if hasattr(t_diaria, 'dims'): # xarray.DataArray
+            return t_diaria.copy(data=risco)
+        # pandas.Series por duck typing (listas também têm .index, mas não
+        # .to_numpy), sem importar o pandas no carregamento do módulo
+        if hasattr(t_diaria, 'index') and hasattr(t_diaria, 'to_numpy'):
+            return type(t_diaria)(risco, index=t_diaria.index, name='risco_dengue')
+        return risco
+
     def classificar_risco(self, indice):
         if indice < 10: return "Baixo"
         if indice < 40: return "Médio"
@@ -65,6 +98,8 @@ class ModeloRiscoDengue:
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Testando Modelo de Risco de Dengue...")
     
     modelo = ModeloRiscoDengue()
@@ -87,11 +122,7 @@ if __name__ == "__main__":
     ts = np.linspace(10, 40, 50)
     cs = np.linspace(0, 150, 50)
     TT, CC = np.meshgrid(ts, cs)
-    RR = np.zeros_like(TT)
-    
-    for i in range(50):
-        for j in range(50):
-            RR[i,j] = modelo.calcular_indice_risco(TT[i,j], CC[i,j])
+    RR = modelo.calcular_indice_risco(TT, CC)
             
     plt.figure(figsize=(8, 6))
     plt.contourf(TT, CC, RR, levels=20, cmap='RdYlGn_r') # Verde=Baixo, Vermelho=Alto
@@ -1,8 +1,6 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 
 """
 MÓDULO DE ANÁLISE DE COMPONENTES PRINCIPAIS (PCA)
@@ -18,16 +16,24 @@ DATA: 2024
 """
 
 class AnalisadorComponentesPrincipais:
-    def __init__(self, n_componentes=0.95):
+    def __init__(self, n_componentes=0.95, dtype=np.float32):
         """
         Inicializa o analisador PCA.
         
         Args:
             n_componentes (float ou int): Se float < 1, número de componentes para explicar a variância.
                                           Se int >= 1, número exato de componentes.
+            dtype: Precisão dos dados normalizados (float32 basta para dados meteorológicos
+                   e reduz à metade o volume lido pelo SVD).
         """
-        self.pca = PCA(n_components=n_componentes)
-        self.scaler = StandardScaler()
+        # SVD randomizado exige nº inteiro de componentes; com fração de variância
+        # o sklearn escolhe o solver exato ('auto').
+        solver = 'randomized' if isinstance(n_componentes, (int, np.integer)) else 'auto'
+        self.pca = PCA(n_components=n_componentes, svd_solver=solver)
+        self.dtype = dtype
+        # Média e desvio padrão por variável (mesmos mean_/scale_ do StandardScaler)
+        self.media_ = None
+        self.escala_ = None
         self.feature_names = None
         self.dados_reduzidos = None
         
@@ -41,16 +47,28 @@ class AnalisadorComponentesPrincipais:
         Retorna:
             ndarray: Dados transformados no espaço dos componentes principais.
         """
+        self.feature_names = df_dados.columns.tolist()
+        # Cópia própria: a imputação e a normalização abaixo são feitas no lugar
+        dados = df_dados.to_numpy(dtype=self.dtype, copy=True)
+        
         # Verificar integridade dos dados
-        if df_dados.isnull().values.any():
+        nans = np.isnan(dados)
+        if nans.any():
             print("ALERTA: Dados contêm NaNs. Preenchendo com média.")
-            df_dados = df_dados.fillna(df_dados.mean())
-            
-        self.feature_names = df_dados.columns.tolist()
+            media_colunas = np.nanmean(dados, axis=0, dtype=np.float64)
+            linhas, colunas = np.nonzero(nans)
+            dados[linhas, colunas] = media_colunas[colunas]
         
         # 1. Normalização (Crucial para PCA em dados com unidades diferentes)
         print("Normalizando dados (Média=0, Variância=1)...")
-        dados_normalizados = self.scaler.fit_transform(df_dados)
+        # Momentos acumulados em float64 (estabilidade); aplicação no lugar,
+        # sem alocar uma segunda matriz N x D
+        self.media_ = dados.mean(axis=0, dtype=np.float64)
+        desvio = dados.std(axis=0, dtype=np.float64)
+        self.escala_ = np.where(desvio == 0, 1.0, desvio) # coluna constante: não escala
+        dados -= self.media_.astype(self.dtype)
+        dados /= self.escala_.astype(self.dtype)
+        dados_normalizados = dados
         
         # 2. Aplicação do PCA
         print(f"Aplicando PCA com n_components={self.pca.n_components}...")
@@ -82,18 +100,21 @@ class AnalisadorComponentesPrincipais:
         relatorio.append(f"Variância Total Explicada: {sum(self.pca.explained_variance_ratio_):.4f}")
         relatorio.append("-" * 50)
         
-        cargas = self.obter_cargas()
+        # Direto sobre components_ (k, D): as 3 maiores cargas em módulo por
+        # componente de uma vez, sem montar/ordenar DataFrames por componente
+        cargas = np.ascontiguousarray(self.pca.components_)
+        top3_idx = np.argsort(-np.abs(cargas), axis=1, kind='stable')[:, :3]
         
-        for i, col in enumerate(cargas.columns):
+        for i, idx in enumerate(top3_idx):
             var_exp = self.pca.explained_variance_ratio_[i]
-            relatorio.append(f"\n{col} (Explica {var_exp*100:.2f}% da variância):")
+            relatorio.append(f"\nPC{i+1} (Explica {var_exp*100:.2f}% da variância):")
             
             # Identificar variáveis mais influentes neste componente
-            influencias = cargas[col].abs().sort_values(ascending=False).head(3)
             relatorio.append("  Variáveis Dominantes:")
-            for var, peso in influencias.items():
-                sinal = "+" if cargas.loc[var, col] > 0 else "-"
-                relatorio.append(f"    {sinal} {var}: {abs(peso):.4f}")
+            for j in idx:
+                peso = cargas[i, j]
+                sinal = "+" if peso > 0 else "-"
+                relatorio.append(f"    {sinal} {self.feature_names[j]}: {abs(peso):.4f}")
                 
         return "\n".join(relatorio)
 
@@ -104,27 +125,30 @@ class AnalisadorComponentesPrincipais:
         if self.pca.explained_variance_ratio_ is None:
             print("Erro: Modelo não ajustado.")
             return
-            
-        plt.figure(figsize=(10, 6))
+        
+        # Figura avulsa com canvas Agg: o gráfico só é salvo (nunca exibido),
+        # então não passa pelo pyplot nem depende de display
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         x_ticks = range(1, len(self.pca.explained_variance_ratio_) + 1)
         var_ratio = self.pca.explained_variance_ratio_
         var_cumulativa = np.cumsum(var_ratio)
         
-        plt.bar(x_ticks, var_ratio, alpha=0.6, align='center', label='Variância Individual')
-        plt.step(x_ticks, var_cumulativa, where='mid', label='Variância Acumulada', color='red')
+        ax.bar(x_ticks, var_ratio, alpha=0.6, align='center', label='Variância Individual')
+        ax.step(x_ticks, var_cumulativa, where='mid', label='Variância Acumulada', color='red')
         
-        plt.ylabel('Razão de Variância Explicada')
-        plt.xlabel('Componentes Principais')
-        plt.title('Análise PCA - Scree Plot')
-        plt.legend(loc='best')
-        plt.grid(True, linestyle='--', alpha=0.5)
+        ax.set_ylabel('Razão de Variância Explicada')
+        ax.set_xlabel('Componentes Principais')
+        ax.set_title('Análise PCA - Scree Plot')
+        ax.legend(loc='best')
+        ax.grid(True, linestyle='--', alpha=0.5)
         
         if salvar_em:
-            plt.savefig(salvar_em)
+            fig.savefig(salvar_em)
             print(f"Gráfico salvo em: {salvar_em}")
         else:
             print("Gráfico gerado (não salvo).")
-        plt.close()
 
 # ==============================================================================
 # SELF-TEST / DEMONSTRAÇÃO
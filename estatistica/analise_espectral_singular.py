@@ -1,6 +1,7 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
-import matplotlib.pyplot as plt
+from sklearn.utils.extmath import randomized_svd
 
 """
 MÓDULO DE ANÁLISE ESPECTRAL SINGULAR (SSA)
@@ -23,8 +24,12 @@ DATA: 2024
 """
 
 class SingularSpectrumAnalysis:
-    def __init__(self, window_size=12):
+    def __init__(self, window_size=12, n_components=None):
         self.L = window_size # Tamanho da janela (Embedding Dimension)
+        # Nº de componentes do SVD truncado (None = SVD completo). A reconstrução
+        # costuma usar poucos componentes; o SVD aleatorizado calcula só os k
+        # maiores em O(L*K*k) em vez de O(L^2*K).
+        self.n_components = n_components
         self.ts = None
         self.N = 0
         self.K = 0
@@ -42,50 +47,50 @@ class SingularSpectrumAnalysis:
         if self.L > self.N // 2:
             print("AVISO: L deve ser <= N/2 para melhor separabilidade.")
             
-        # 1. Embedding (Matriz Hankel)
-        self.X = np.zeros((self.L, self.K))
-        for i in range(self.K):
-            self.X[:, i] = self.ts[i : i + self.L]
+        # 1. Embedding (Matriz Hankel): X[i, j] = ts[i + j]
+        # Visão com strides sobre a própria série (sem cópia, somente leitura)
+        self.X = sliding_window_view(np.ascontiguousarray(self.ts), self.L).T
+        
+        # Índice da antidiagonal de cada elemento (t = i + j) e nº de elementos
+        # por antidiagonal, reutilizados em toda reconstrução
+        self._idx_antidiagonal = (np.arange(self.L)[:, None] + np.arange(self.K)[None, :]).ravel()
+        self._contagem_antidiagonal = np.bincount(self._idx_antidiagonal, minlength=self.N)
             
         # 2. SVD
         # X = U * Sigma * V.T
-        self.U, self.Sigma, self.Vt = np.linalg.svd(self.X, full_matrices=False)
+        if self.n_components is None:
+            self.U, self.Sigma, self.Vt = np.linalg.svd(self.X, full_matrices=False)
+        else:
+            self.U, self.Sigma, self.Vt = randomized_svd(self.X, n_components=self.n_components,
+                                                         n_oversamples=10, random_state=0)
         
         # Variância explicada pelos componentes (Eigenvalues)
+        # Total = soma de todos os sigma^2 = ||X||_F^2 (válido também no SVD truncado)
         self.eigenvalues = self.Sigma**2
-        self.explained_variance = self.eigenvalues / np.sum(self.eigenvalues)
+        self.explained_variance = self.eigenvalues / np.sum(self.X**2)
         
     def reconstruct(self, component_indices):
         """
         Reconstroi a série temporal usando apenas os componentes selecionados.
         (Passos 3 e 4)
         """
-        # Reconstruir Matriz Elementar Xr
-        Xr = np.zeros_like(self.X)
-        
-        for i in component_indices:
-            # Componente i: sigma_i * u_i * v_i.T
-            # Nota: numpy svd retorna Vt, então linha i de Vt
-            Xi = self.Sigma[i] * np.outer(self.U[:, i], self.Vt[i, :])
-            Xr += Xi
+        # Reconstruir Matriz Elementar Xr = sum_i sigma_i * u_i * v_i.T
+        # Todos os componentes num único GEMM: (U[:, idx] * Sigma[idx]) @ Vt[idx, :]
+        # Nota: numpy svd retorna Vt, então linhas idx de Vt
+        idx = np.atleast_1d(np.asarray(component_indices, dtype=int))
+        Xr = (self.U[:, idx] * self.Sigma[idx]) @ self.Vt[idx, :]
             
         # 4. Diagonal Averaging (Hankelization)
-        rec_series = np.zeros(self.N)
-        count = np.zeros(self.N)
-        
-        for i in range(self.L): # Linhas
-            for j in range(self.K): # Colunas
-                t = i + j
-                rec_series[t] += Xr[i, j]
-                count[t] += 1
-                
-        return rec_series / count
+        # Soma de cada antidiagonal i + j = t em um único laço C (bincount)
+        rec_series = np.bincount(self._idx_antidiagonal, weights=Xr.ravel(), minlength=self.N)
+        return rec_series / self._contagem_antidiagonal
 
     def plot_w_correlation(self):
         """
         Plota matriz de W-correlação para verificar separabilidade dos componentes.
         (Avançado - Implementação simplificada aqui apenas da variância)
         """
+        import matplotlib.pyplot as plt # importado só quando há gráfico
         plt.figure(figsize=(10, 4))
         plt.bar(range(len(self.explained_variance)), self.explained_variance * 100)
         plt.title('Espectro de Valores Singulares (Variância Explicada %)')
@@ -97,6 +102,8 @@ class SingularSpectrumAnalysis:
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Iniciando Análise Espectral Singular (SSA)...")
     
     # Gerar série sintética
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq
 
 def analise_espectral_fourier(dados, frequencia_amostragem=1.0):
     """
@@ -10,8 +10,9 @@ def analise_espectral_fourier(dados, frequencia_amostragem=1.0):
     # Remover média para evitar pico em zero
     dados_detrended = dados - np.mean(dados)
     
-    yf = fft(dados_detrended)
-    xf = fftfreq(n, 1 / frequencia_amostragem)[:n//2]
+    # Entrada real: espectro conjugado-simétrico, basta a metade positiva (rfft)
+    yf = rfft(dados_detrended, workers=-1)
+    xf = rfftfreq(n, 1 / frequencia_amostragem)[:n//2]
     
     amplitudes = 2.0/n * np.abs(yf[0:n//2])
     
@@ -1,14 +1,42 @@
 import numpy as np
-from scipy import signal
+from scipy import fft
+
+def _ricker(pontos, largura):
+    """Wavelet de Ricker (Mexican Hat) com `pontos` amostras e largura `largura`."""
+    A = 2 / (np.sqrt(3 * largura) * (np.pi**0.25))
+    x = np.arange(0, pontos) - (pontos - 1.0) / 2
+    xsq = x**2
+    wsq = largura**2
+    return A * (1 - xsq / wsq) * np.exp(-xsq / (2 * wsq))
 
 def analise_wavelet_morlet(dados):
     """
     Realiza Transformada Contínua de Wavelet (CWT) usando a wavelet de Ricker (Mexican Hat)
     como aproximação simplificada sem dependência pesada de pywt se não estiver disponível.
-    (Aqui usaremos scipy.signal.cwt com ricker para robustez padrão)
+    (Mesma definição do antigo scipy.signal.cwt com ricker: convolução 'same' com
+    min(10*largura, N) amostras da wavelet por escala.)
+
+    As convoluções são feitas no domínio da frequência: uma única FFT dos dados,
+    multiplicada pelo espectro de todas as escalas de uma vez e uma IFFT em lote,
+    O(W·N·logN) em vez de W convoluções diretas O(N·w).
     """
+    dados = np.asarray(dados, dtype=float)
+    n = len(dados)
+
     # Larguras para a wavelet (escalas)
     larguras = np.arange(1, 100)
-    
-    cwtmatr = signal.cwt(dados, signal.ricker, larguras)
+
+    comprimentos = np.minimum(10 * larguras, n)
+    nfft = fft.next_fast_len(n + comprimentos.max() - 1, real=True)
+
+    # Banco de wavelets (uma por linha, alinhadas no início) e seus espectros
+    banco = np.zeros((len(larguras), nfft))
+    for i, (m, w) in enumerate(zip(comprimentos, larguras)):
+        banco[i, :m] = _ricker(m, w)
+    espectro = fft.rfft(dados, n=nfft) * fft.rfft(banco, axis=-1)
+    convolucao = fft.irfft(espectro, n=nfft, axis=-1)
+
+    # Modo 'same': janela de N amostras centrada na convolução completa de cada escala
+    inicio = (comprimentos - 1) // 2
+    cwtmatr = convolucao[np.arange(len(larguras))[:, None], inicio[:, None] + np.arange(n)]
     return larguras, cwtmatr
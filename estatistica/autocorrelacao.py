@@ -4,9 +4,41 @@ import pandas as pd
 def calcular_autocorrelacao(serie, lag=30):
     """
     Calcula a função de autocorrelação (ACF) até o lag especificado.
+
+    Mesmo resultado de `serie.autocorr(lag=k)` (correlação de Pearson entre
+    x[:-k] e x[k:]), mas com todos os lags de uma vez: os produtos cruzados
+    vêm de uma única FFT (Wiener-Khinchin) e as médias/variâncias dos trechos
+    de somas acumuladas. O(N log N) no total em vez de O(N·lag).
+    Lags sem ao menos 2 pares ou com trecho constante dão NaN, como no pandas.
     """
-    acf_valores = []
-    for i in range(lag + 1):
-        coef = serie.autocorr(lag=i)
-        acf_valores.append(coef)
-    return acf_valores
+    x = np.asarray(serie, dtype=float)
+    if np.isnan(x).any():
+        # Falhas na série: o pandas descarta só os pares com NaN em cada lag
+        serie = pd.Series(x)
+        return [serie.autocorr(lag=i) for i in range(lag + 1)]
+    
+    x = x - x.mean() # centrar melhora a estabilidade numérica das somas
+    n = len(x)
+    lags = np.arange(max(min(lag, n - 2), -1) + 1) # lags com ao menos 2 pares
+    m = n - lags # nº de pares em cada lag
+    acf_valores = np.full(lag + 1, np.nan)
+    if lags.size == 0:
+        return acf_valores.tolist()
+
+    f = np.fft.rfft(x, n=2 * n)
+    cruzado = np.fft.irfft(f * np.conj(f), n=2 * n)[:lags.size] # sum(x[:-k] * x[k:])
+
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    soma_a, soma_b = s1[m], s1[n] - s1[lags] # x[:-k] e x[k:]
+    quad_a, quad_b = s2[m], s2[n] - s2[lags]
+
+    cov = cruzado - soma_a * soma_b / m
+    var_a = quad_a - soma_a**2 / m
+    var_b = quad_b - soma_b**2 / m
+    # Trecho constante: a variância por somas acumuladas sobra como resíduo de
+    # arredondamento, então o limiar é relativo à soma de quadrados da série
+    tol = 1e-12 * s2[n]
+    validos = (var_a > tol) & (var_b > tol)
+    acf_valores[:lags.size][validos] = cov[validos] / np.sqrt(var_a[validos] * var_b[validos])
+    return acf_valores.tolist()
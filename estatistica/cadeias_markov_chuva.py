@@ -7,7 +7,7 @@ def cadeia_markov_chuva(precipitacao_serie):
     Estado 0: Seco (< 1mm)
     Estado 1: Chuvoso (>= 1mm)
     """
-    estados = (precipitacao_serie >= 1.0).astype(int)
+    estados = (np.asarray(precipitacao_serie) >= 1.0).astype(np.intp)
     
     # Matriz de transição
     # P00: Seco -> Seco
@@ -15,12 +15,10 @@ def cadeia_markov_chuva(precipitacao_serie):
     # P10: Chuvoso -> Seco
     # P11: Chuvoso -> Chuvoso
     
-    transicoes = np.zeros((2, 2))
-    
-    for i in range(len(estados)-1):
-        atual = estados[i]
-        proximo = estados[i+1]
-        transicoes[atual, proximo] += 1
+    # Cada par (atual, próximo) vira o índice 2*atual + próximo: uma única
+    # contagem em C no lugar do laço Python
+    pares = (estados[:-1] << 1) | estados[1:]
+    transicoes = np.bincount(pares, minlength=4).reshape(2, 2).astype(float)
         
     probabilidades = transicoes / transicoes.sum(axis=1, keepdims=True)
     
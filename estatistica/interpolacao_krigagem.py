@@ -1,6 +1,8 @@
 import numpy as np
+from scipy.spatial.distance import cdist
+from scipy.linalg import cho_factor, cho_solve, LinAlgError
 import pandas as pd
-import matplotlib.pyplot as plt
+from nucleo.aceleracao import njit, NUMBA_DISPONIVEL
 
 """
 MÓDULO DE INTERPOLAÇÃO ESPACIAL (KRIGAGEM)
@@ -16,7 +18,53 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Kernels compilados do variograma, um por modelo: uma única passada sobre h,
+# sem máscaras nem arrays temporários. gamma(0) = 0 em todos os modelos.
+@njit(fastmath=True, cache=True)
+def _vgm_esferico(h, a, c0, cn):
+    hf = h.ravel()
+    val = np.empty_like(hf)
+    for i in range(hf.size):
+        hi = abs(hf[i])
+        if hi == 0:
+            val[i] = 0.0
+        elif hi <= a:
+            r = hi / a
+            val[i] = cn + (c0 - cn) * (1.5*r - 0.5*r*r*r)
+        else:
+            val[i] = c0 # Patamar
+    return val.reshape(h.shape)
+
+@njit(fastmath=True, cache=True)
+def _vgm_exponencial(h, a, c0, cn):
+    hf = h.ravel()
+    val = np.empty_like(hf)
+    for i in range(hf.size):
+        hi = abs(hf[i])
+        val[i] = 0.0 if hi == 0 else cn + (c0 - cn) * (1 - np.exp(-3 * hi / a))
+    return val.reshape(h.shape)
+
+@njit(fastmath=True, cache=True)
+def _vgm_gaussiano(h, a, c0, cn):
+    hf = h.ravel()
+    val = np.empty_like(hf)
+    for i in range(hf.size):
+        hi = abs(hf[i])
+        r = hi / a
+        val[i] = 0.0 if hi == 0 else cn + (c0 - cn) * (1 - np.exp(-3 * r*r))
+    return val.reshape(h.shape)
+
+_KERNELS_VARIOGRAMA = {
+    'esferico': _vgm_esferico,
+    'exponencial': _vgm_exponencial,
+    'gaussiano': _vgm_gaussiano,
+}
+
 class KrigagemSimples:
+    # Lado dos blocos de K: distância + covariância de um bloco 256x256
+    # (~0.5 MB em float64) cabem no cache L2
+    TAMANHO_BLOCO = 256
+
     def __init__(self, modelo_variograma='esferico', alcance=5.0, patamar=10.0, pepita=1.0):
         """
         Args:
@@ -30,12 +78,21 @@ class KrigagemSimples:
         self.c0 = patamar
         self.c_n = pepita
         
+        # Kernel compilado do modelo escolhido (resolvido uma vez, não a cada chamada).
+        # Sem Numba o kernel seria um laço Python: mantém-se o caminho NumPy.
+        self._vgm = _KERNELS_VARIOGRAMA.get(modelo_variograma) if NUMBA_DISPONIVEL else None
+        
         self.X_treino = None
         self.y_treino = None
-        self.K_inv = None # Matriz de covariância invertida
+        self.K_cf = None # Fator de Cholesky da matriz de covariância K
+        self._K_inv_1 = None # K^-1 1 (termo fixo do Lagrangiano)
+        self._soma_K_inv_1 = None # 1^T K^-1 1
         
     def _variograma_func(self, h):
         """Calcula gamma(h) - Semivariância."""
+        if self._vgm is not None:
+            return self._vgm(np.ascontiguousarray(h, dtype=np.float64), self.a, self.c0, self.c_n)
+        
         h = np.abs(h)
         val = np.zeros_like(h)
         
@@ -76,30 +133,34 @@ class KrigagemSimples:
         # Construir matriz de distância par-a-par
         print(f"Ajustando Krigagem para {n} pontos...")
         
-        dist_mat = np.zeros((n, n))
-        for i in range(n):
-            for j in range(n):
-                dist_mat[i,j] = np.linalg.norm(self.X_treino[i] - self.X_treino[j])
-                
-        # Matriz de Covariância K
-        K = self._covariancia_func(dist_mat)
+        # Matriz de Covariância K (simétrica positiva definida; o pequeno
+        # reforço na diagonal absorve arredondamentos), montada em blocos:
+        # só o triângulo superior é calculado e espelhado no inferior
+        B = self.TAMANHO_BLOCO
+        X = self.X_treino
+        K = np.empty((n, n))
+        for i0 in range(0, n, B):
+            for j0 in range(i0, n, B):
+                bloco = self._covariancia_func(cdist(X[i0:i0+B], X[j0:j0+B]))
+                K[i0:i0+B, j0:j0+B] = bloco
+                if j0 != i0:
+                    K[j0:j0+B, i0:i0+B] = bloco.T
+        K[np.diag_indices(n)] += 1e-10
         
         # Adicionar restrição de Lagrangiano (Krigagem Ordinária: soma pesos = 1)
         # Sistema estendido:
         # | K   1 | | w |   | k |
         # | 1^T 0 | | mu| = | 1 |
-        
-        K_ext = np.ones((n+1, n+1))
-        K_ext[:n, :n] = K
-        K_ext[n, n] = 0
-        
-        # Inverter K_ext (parte custosa O(N^3))
-        # Para N pequeno (<1000) é rápido.
+        # Resolvido por partição (complemento de Schur) sobre o Cholesky de K,
+        # que custa metade de uma LU e nunca forma a inversa.
         try:
-            self.K_inv = np.linalg.inv(K_ext)
-            print("Matriz invertida com sucesso.")
-        except np.linalg.LinAlgError:
+            self.K_cf = cho_factor(K, lower=True)
+        except LinAlgError:
             print("ERRO: Matriz singular. Verifique pontos duplicados.")
+            return
+        self._K_inv_1 = cho_solve(self.K_cf, np.ones(n))
+        self._soma_K_inv_1 = self._K_inv_1.sum()
+        print("Matriz fatorada com sucesso.")
             
     def predizer(self, pontos_alvo):
         """
@@ -107,46 +168,37 @@ class KrigagemSimples:
         Pontos alvo: array (M, 2)
         """
         pontos_alvo = np.array(pontos_alvo)
-        m = len(pontos_alvo)
-        n = len(self.y_treino)
         
-        estimativas = np.zeros(m)
-        variancias = np.zeros(m)
+        # Distâncias alvo-treino de todos os pontos de uma vez (M, N)
+        dists_alvo = cdist(pontos_alvo, self.X_treino)
+        
+        # Vetores k (covariância alvo-treino) como colunas
+        k_cov = self._covariancia_func(dists_alvo).T # (N, M)
+        
+        # Pesos lambda de todos os alvos num único solve triangular (N, M):
+        # lambda = K^-1 k + K^-1 1 * (1 - 1^T K^-1 k) / (1^T K^-1 1)
+        K_inv_k = cho_solve(self.K_cf, k_cov)
+        correcao = (1.0 - K_inv_k.sum(axis=0)) / self._soma_K_inv_1 # (M,)
+        lambdas = K_inv_k + np.outer(self._K_inv_1, correcao)
+        
+        # Valor Estimado = soma(lambda_i * z_i)
+        estimativas = lambdas.T @ self.y_treino
+        
+        # Variância de Krigagem (Erro)
+        # sigma^2 = Sill - sum(lambda * Cov) - mu
+        # Multiplicador de Lagrange: mu = -(1 - 1^T K^-1 k) / (1^T K^-1 1)
+        mu = -correcao
+        # einsum reduz coluna a coluna sem materializar o produto (N, M)
+        variancias = self.c0 - np.einsum('ij,ij->j', lambdas, k_cov) - mu
         
-        for i in range(m):
-            pt = pontos_alvo[i]
-            
-            # Distâncias para os pontos de treino
-            dists = np.linalg.norm(self.X_treino - pt, axis=1)
-            
-            # Vetor k (covariância alvo-treino)
-            k_cov = self._covariancia_func(dists)
-            
-            # Estender k
-            k_ext = np.ones(n+1)
-            k_ext[:n] = k_cov
-            
-            # Pesos lambda = K_inv * k
-            pesos = np.dot(self.K_inv, k_ext)
-            
-            # Valor Estimado = soma(lambda_i * z_i) (descartando o mu do Lagrangiano)
-            lambdas = pesos[:n]
-            estimativa = np.sum(lambdas * self.y_treino)
-            estimativas[i] = estimativa
-            
-            # Variância de Krigagem (Erro)
-            # sigma^2 = Sill - sum(lambda * Cov) - mu
-            # mu é o último elemento de 'pesos'
-            mu = pesos[n]
-            var = self.c0 - np.sum(lambdas * k_cov) - mu
-            variancias[i] = var
-            
         return estimativas, variancias
 
 # ==============================================================================
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Testando Krigagem Ordinária Manual...")
     
     # 1. Pontos fictícios (Estações Meteorológicas)
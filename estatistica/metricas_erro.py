@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from nucleo.aceleracao import njit, NUMBA_DISPONIVEL
 
 """
 MÓDULO DE MÉTRICAS DE ERRO E VALIDAÇÃO
@@ -14,6 +15,43 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Somas acumuladas de que todas as métricas derivam, relativas à média
+# observada ō (estável numericamente):
+#   Σr, Σ|r|, Σr², Σ|r|/|o| (o != 0), Σ(o-ō)², Σ(s-ō), Σ(s-ō)², Σ(o-ō)(s-ō),
+#   Σ(|s-ō| + |o-ō|)²   com r = s - o
+@njit(fastmath=True, cache=True)
+def _somas_metricas(obs, sim, obs_media):
+    s_r = s_abs = s_r2 = s_ape = 0.0
+    s_do2 = s_ds = s_ds2 = s_dods = s_will = 0.0
+    for i in range(obs.size):
+        r = sim[i] - obs[i]
+        ar = abs(r)
+        do = obs[i] - obs_media
+        ds = sim[i] - obs_media
+        s_r += r
+        s_abs += ar
+        s_r2 += r * r
+        if obs[i] != 0:
+            s_ape += ar / abs(obs[i])
+        s_do2 += do * do
+        s_ds += ds
+        s_ds2 += ds * ds
+        s_dods += do * ds
+        w = abs(ds) + abs(do)
+        s_will += w * w
+    return s_r, s_abs, s_r2, s_ape, s_do2, s_ds, s_ds2, s_dods, s_will
+
+def _somas_metricas_numpy(obs, sim, obs_media):
+    """Mesmas somas de `_somas_metricas` com operações vetoriais (sem Numba)."""
+    r = sim - obs
+    ar = np.abs(r)
+    do = obs - obs_media
+    ds = sim - obs_media
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ape = np.where(obs != 0, ar / np.abs(obs), 0.0)
+    return (r.sum(), ar.sum(), r @ r, ape.sum(), do @ do, ds.sum(), ds @ ds,
+            do @ ds, np.sum((np.abs(ds) + np.abs(do))**2))
+
 class AvaliadorModelo:
     def __init__(self, observado, simulado):
         self.obs = np.array(observado)
@@ -23,29 +61,38 @@ class AvaliadorModelo:
     def _validar(self):
         if self.obs.shape != self.sim.shape:
             raise ValueError("Vetores de observação e simulação devem ter mesmo tamanho.")
-        # Remover NaNs conjuntos
-        mask = (~np.isnan(self.obs)) & (~np.isnan(self.sim))
+        # Remover NaNs (e infinitos) conjuntos: uma única máscara, combinada no lugar
+        mask = np.isfinite(self.obs)
+        np.logical_and(mask, np.isfinite(self.sim), out=mask)
         self.obs = self.obs[mask]
         self.sim = self.sim[mask]
+        # Todas as métricas saem de uma única passada sobre obs/sim
+        obs = np.ascontiguousarray(self.obs, dtype=np.float64)
+        sim = np.ascontiguousarray(self.sim, dtype=np.float64)
+        # np.float64 (não float/int de Python): sem pares válidos (n = 0) as razões
+        # dão nan como np.mean de um vetor vazio, em vez de ZeroDivisionError
+        self._n = np.float64(obs.size)
+        self._obs_mean = obs.mean()
+        somas = _somas_metricas if NUMBA_DISPONIVEL else _somas_metricas_numpy
+        (self._s_resid, self._s_abs_resid, self._s_resid2, self._s_ape, self._s_dev_obs2,
+         self._s_dev_sim, self._s_dev_sim2, self._s_dev_obs_sim,
+         self._s_willmott) = map(np.float64, somas(obs, sim, self._obs_mean))
         
     def rmse(self):
         """Root Mean Squared Error."""
-        return np.sqrt(np.mean((self.sim - self.obs)**2))
+        return np.sqrt(self._s_resid2 / self._n)
         
     def mae(self):
         """Mean Absolute Error."""
-        return np.mean(np.abs(self.sim - self.obs))
+        return self._s_abs_resid / self._n
         
     def bias(self):
         """Viés Médio (Sim - Obs)."""
-        return np.mean(self.sim - self.obs)
+        return self._s_resid / self._n
         
     def mape(self):
-        """Mean Absolute Percentage Error (%). Cuidado com zeros."""
-        with np.errstate(divide='ignore', invalid='ignore'):
-            val = np.abs((self.obs - self.sim) / self.obs)
-            val = np.nan_to_num(val, nan=0.0, posinf=0.0, neginf=0.0)
-        return np.mean(val) * 100.0
+        """Mean Absolute Percentage Error (%). Cuidado com zeros (obs = 0 conta como erro 0)."""
+        return self._s_ape / self._n * 100.0
 
     def nash_sutcliffe(self):
         """
@@ -55,8 +102,8 @@ class AvaliadorModelo:
         NSE = 0: Modelo tão bom quanto a média observada.
         NSE < 0: Modelo pior que a média.
         """
-        numerador = np.sum((self.obs - self.sim)**2)
-        denominador = np.sum((self.obs - np.mean(self.obs))**2)
+        numerador = self._s_resid2
+        denominador = self._s_dev_obs2
         
         if denominador == 0: return -np.inf
         return 1.0 - (numerador / denominador)
@@ -66,29 +113,30 @@ class AvaliadorModelo:
         Índice de Concordância de Willmott (d).
         Varia de 0 (sem concordância) a 1 (concordância perfeita).
         """
-        numerador = np.sum((self.sim - self.obs)**2)
-        
-        abs_sim = np.abs(self.sim - np.mean(self.obs))
-        abs_obs = np.abs(self.obs - np.mean(self.obs))
-        
-        denominador = np.sum((abs_sim + abs_obs)**2)
+        numerador = self._s_resid2
+        denominador = self._s_willmott
         
         if denominador == 0: return 0.0
         return 1.0 - (numerador / denominador)
 
     def correlacao_pearson(self):
         """R de Pearson."""
-        return np.corrcoef(self.obs, self.sim)[0, 1]
+        # Σ(o-ō) = 0 por construção; a covariância só precisa corrigir a média de sim
+        cov = self._s_dev_obs_sim
+        var_sim = self._s_dev_sim2 - self._s_dev_sim**2 / self._n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.float64(cov) / np.sqrt(self._s_dev_obs2 * var_sim)
 
     def relatorio_completo(self):
         """Retorna string formatada com todas as métricas."""
+        r = self.correlacao_pearson()
         metricas = {
             "RMSE": self.rmse(),
             "MAE": self.mae(),
             "Bias": self.bias(),
             "MAPE (%)": self.mape(),
-            "R (Pearson)": self.correlacao_pearson(),
-            "R²": self.correlacao_pearson()**2,
+            "R (Pearson)": r,
+            "R²": r * r,
             "Nash-Sutcliffe": self.nash_sutcliffe(),
             "Willmott d": self.indice_willmott_d()
         }
@@ -1,7 +1,9 @@
+import math
 import numpy as np
 import pandas as pd
 import scipy.stats as stats
-import matplotlib.pyplot as plt
+from scipy.linalg import solve_triangular
+from nucleo.aceleracao import guvectorize
 
 """
 MÓDULO DE REGRESSÃO MULTIVARIADA AVANÇADA
@@ -18,6 +20,45 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@guvectorize(['(f8[:,:], f8[:], f8[:])'], '(n,p),(n)->(p)', nopython=True, target='parallel')
+def ols_batch(X, y, beta):
+    """
+    Muitos ajustes OLS numa única chamada (células de grade, janelas móveis):
+    X de forma (G, n, p) e y de forma (G, n) devolvem betas (G, p), com os G
+    modelos distribuídos entre os núcleos. X deve já conter a coluna de 1s
+    se houver intercepto. Cada ajuste resolve X'X beta = X'y por Cholesky;
+    um modelo singular devolve NaN.
+    """
+    n, p = X.shape
+    # Equações normais (triângulo inferior de X'X)
+    A = np.zeros((p, p))
+    b = np.zeros(p)
+    for i in range(n):
+        for j in range(p):
+            b[j] += X[i, j] * y[i]
+            for k in range(j + 1):
+                A[j, k] += X[i, j] * X[i, k]
+    # Cholesky A = L L^T, no lugar no triângulo inferior de A; pivô que some
+    # diante da diagonal original indica colunas linearmente dependentes
+    for j in range(p):
+        diag_original = A[j, j]
+        for k in range(j):
+            A[j, j] -= A[j, k] * A[j, k]
+        A[j, j] = np.sqrt(A[j, j]) if A[j, j] > 1e-12 * diag_original else np.nan
+        for i in range(j + 1, p):
+            for k in range(j):
+                A[i, j] -= A[i, k] * A[j, k]
+            A[i, j] /= A[j, j]
+    # L z = b (substituição progressiva) e L^T beta = z (regressiva)
+    for j in range(p):
+        for k in range(j):
+            b[j] -= A[j, k] * b[k]
+        b[j] /= A[j, j]
+    for j in range(p - 1, -1, -1):
+        for k in range(j + 1, p):
+            b[j] -= A[k, j] * beta[k]
+        beta[j] = b[j] / A[j, j]
+
 class RegressaoLinearMultipla:
     def __init__(self):
         self.coeficientes = None
@@ -29,7 +70,9 @@ class RegressaoLinearMultipla:
     def ajustar(self, X, y):
         """
         Ajusta o modelo OLS: y = X*beta + e
-        Usa Algebra Matricial Direta: beta = (X^T X)^-1 X^T y
+        Resolve por decomposição QR: X = QR  =>  R beta = Q^T y
+        (equivale a beta = (X^T X)^-1 X^T y sem elevar ao quadrado o
+        condicionamento de X, importante com preditores colineares)
         """
         X = np.array(X)
         y = np.array(y)
@@ -39,15 +82,14 @@ class RegressaoLinearMultipla:
         X_design = np.c_[np.ones(n), X]
         p_total = p + 1
         
-        # Equação Normal
-        try:
-            XtX = X_design.T @ X_design
-            XtX_inv = np.linalg.inv(XtX)
-            Xty = X_design.T @ y
-            beta = XtX_inv @ Xty
-        except np.linalg.LinAlgError:
+        # Mínimos quadrados via QR reduzida; diagonal de R ~ 0 indica posto
+        # deficiente (colunas linearmente dependentes)
+        Q, R = np.linalg.qr(X_design, mode='reduced')
+        diag_R = np.abs(np.diag(R))
+        if diag_R.min() <= max(n, p_total) * np.finfo(float).eps * diag_R.max():
             print("ERRO: Matriz singular. Multicolinearidade perfeita?")
             return
+        beta = solve_triangular(R, Q.T @ y, check_finite=False)
             
         self.intercepto = beta[0]
         self.coeficientes = beta[1:]
@@ -60,8 +102,10 @@ class RegressaoLinearMultipla:
         
         # Soma dos Quadrados
         y_bar = np.mean(y)
-        sst = np.sum((y - y_bar)**2) # Total
-        sse = np.sum(self.residuos**2) # Erro (Residual)
+        # Produtos internos (ddot) em vez de quadrado + soma: sem temporários
+        yc = y - y_bar
+        sst = yc @ yc # Total
+        sse = self.residuos @ self.residuos # Erro (Residual)
         ssr = sst - sse # Regressão
         
         # Graus de Liberdade
@@ -78,21 +122,29 @@ class RegressaoLinearMultipla:
         r2_adj = 1 - (1 - r2) * (df_total / df_res)
         
         # Erro Padrão dos Coeficientes
-        # Cov(beta) = MSE * (X'X)^-1
-        cov_beta = mse * XtX_inv
-        se_beta = np.sqrt(np.diag(cov_beta))
+        # Cov(beta) = MSE * (X'X)^-1, com (X'X)^-1 = R^-1 R^-T: a diagonal é a
+        # soma dos quadrados de cada linha de R^-1
+        R_inv = solve_triangular(R, np.eye(p_total), check_finite=False)
+        se_beta = np.sqrt(mse * np.einsum('ij,ij->i', R_inv, R_inv))
         
         # Estatística t e p-valor
         t_stats = beta / se_beta
-        p_values = [2 * (1 - stats.t.cdf(np.abs(t), df_res)) for t in t_stats]
+        # sf (= 1 - cdf) vetorizado: uma chamada e sem cancelamento na cauda
+        p_values = 2.0 * stats.t.sf(np.abs(t_stats), df_res)
         
         # Estatística F
         msr = ssr / df_reg if df_reg > 0 else 0
         f_stat = msr / mse if mse > 0 else 0
-        f_pvalue = 1 - stats.f.cdf(f_stat, df_reg, df_res)
+        f_pvalue = stats.f.sf(f_stat, df_reg, df_res)
         
         # Durbin-Watson (Autocorrelação dos resíduos)
-        dw = np.sum(np.diff(self.residuos)**2) / sse
+        # sum (r_t - r_t-1)^2 = 2*SSE - r_0^2 - r_n^2 - 2*sum r_t*r_t-1: um só
+        # produto interno entre fatias (vistas), sem alocar o vetor de diferenças
+        r = self.residuos
+        dw = (2 * sse - r[0]**2 - r[-1]**2 - 2 * (r[1:] @ r[:-1])) / sse
+        
+        # Ajuste perfeito (SSE = 0): log-verossimilhança ilimitada, AIC/BIC -> -inf
+        log_sse_n = math.log(sse / n) if sse > 0 else -math.inf
         
         self.stats = {
             'n_obs': n,
@@ -102,8 +154,8 @@ class RegressaoLinearMultipla:
             'f_stat': f_stat,
             'f_pvalue': f_pvalue,
             'sse': sse,
-            'aic': n * np.log(sse/n) + 2*p_total, # Akaike
-            'bic': n * np.log(sse/n) + p_total*np.log(n), # Bayes
+            'aic': n * log_sse_n + 2*p_total, # Akaike
+            'bic': n * log_sse_n + p_total*math.log(n), # Bayes
             'durbin_watson': dw,
             'betas': beta,
             'std_errs': se_beta,
@@ -147,6 +199,7 @@ class RegressaoLinearMultipla:
     def plotar_diagnosticos(self):
         """Plota gráficos de resíduos para validar pressupostos."""
         if self.residuos is None: return
+        import matplotlib.pyplot as plt # importado só quando há gráfico
         
         fig, axes = plt.subplots(1, 2, figsize=(14, 5))
         
@@ -1,6 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+from scipy.integrate import solve_ivp
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE TEORIA DO CAOS E SISTEMAS DINÂMICOS
@@ -20,6 +20,48 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Integradores RK4 de passo fixo compilados: sem callbacks Python por passo.
+# Servem quando basta a evolução relativa das trajetórias (divergência).
+@njit(fastmath=True, cache=True)
+def _derivadas_lorenz(x, y, z, sigma, rho, beta):
+    return sigma * (y - x), x * (rho - z) - y, x * y - beta * z
+
+@njit(fastmath=True, cache=True)
+def _passo_rk4(x, y, z, sigma, rho, beta, dt):
+    k1x, k1y, k1z = _derivadas_lorenz(x, y, z, sigma, rho, beta)
+    k2x, k2y, k2z = _derivadas_lorenz(x + 0.5*dt*k1x, y + 0.5*dt*k1y, z + 0.5*dt*k1z, sigma, rho, beta)
+    k3x, k3y, k3z = _derivadas_lorenz(x + 0.5*dt*k2x, y + 0.5*dt*k2y, z + 0.5*dt*k2z, sigma, rho, beta)
+    k4x, k4y, k4z = _derivadas_lorenz(x + dt*k3x, y + dt*k3y, z + dt*k3z, sigma, rho, beta)
+    return (x + dt/6 * (k1x + 2*k2x + 2*k3x + k4x),
+            y + dt/6 * (k1y + 2*k2y + 2*k3y + k4y),
+            z + dt/6 * (k1z + 2*k2z + 2*k3z + k4z))
+
+@njit(fastmath=True, cache=True)
+def _lorenz_rk4(x0, y0, z0, sigma, rho, beta, dt, n):
+    # Estrutura de arrays (SoA): cada coordenada num vetor contíguo
+    xs = np.empty(n)
+    ys = np.empty(n)
+    zs = np.empty(n)
+    x, y, z = x0, y0, z0
+    xs[0], ys[0], zs[0] = x, y, z
+    for i in range(1, n):
+        x, y, z = _passo_rk4(x, y, z, sigma, rho, beta, dt)
+        xs[i], ys[i], zs[i] = x, y, z
+    return xs, ys, zs
+
+@njit(fastmath=True, cache=True)
+def _divergencia_rk4(estado_1, estado_2, sigma, rho, beta, dt, n):
+    """Avança as duas trajetórias no mesmo laço e devolve só a distância entre elas."""
+    x1, y1, z1 = estado_1[0], estado_1[1], estado_1[2]
+    x2, y2, z2 = estado_2[0], estado_2[1], estado_2[2]
+    dist = np.empty(n)
+    dist[0] = np.sqrt((x1-x2)**2 + (y1-y2)**2 + (z1-z2)**2)
+    for i in range(1, n):
+        x1, y1, z1 = _passo_rk4(x1, y1, z1, sigma, rho, beta, dt)
+        x2, y2, z2 = _passo_rk4(x2, y2, z2, sigma, rho, beta, dt)
+        dist[i] = np.sqrt((x1-x2)**2 + (y1-y2)**2 + (z1-z2)**2)
+    return dist
+
 class AnalisadorCaosLorenz:
     def __init__(self, sigma=10.0, rho=28.0, beta=8.0/3.0):
         """
@@ -32,33 +74,60 @@ class AnalisadorCaosLorenz:
         self.rho = rho
         self.beta = beta
         
-    def _sistema_lorenz(self, estado, t):
+    def _sistema_lorenz(self, t, estado):
         x, y, z = estado
         
         dxdt = self.sigma * (y - x)
         dydt = x * (self.rho - z) - y
         dzdt = x * y - self.beta * z
         
-        return [dxdt, dydt, dzdt]
+        return np.array([dxdt, dydt, dzdt])
 
-    def simular_trajetoria(self, estado_inicial, t_max=100.0, passos=10000):
-        """Integra o sistema no tempo."""
+    def _jacobiano(self, t, estado):
+        """Jacobiano analítico: o LSODA não precisa estimá-lo por diferenças finitas."""
+        x, y, z = estado
+        return np.array([[-self.sigma, self.sigma, 0.0],
+                         [self.rho - z, -1.0, -x],
+                         [y, x, -self.beta]])
+
+    def simular_trajetoria(self, estado_inicial, t_max=100.0, passos=10000, metodo='lsoda'):
+        """
+        Integra o sistema no tempo.
+        metodo: 'lsoda' (adaptativo, SciPy) ou 'rk4' (passo fixo t_max/(passos-1), compilado).
+        """
+        if metodo == 'rk4':
+            t, xyz = self.trajetoria_soa(estado_inicial, t_max, passos)
+            return t, np.stack(xyz, axis=1)
         t = np.linspace(0, t_max, passos)
-        solucao = odeint(self._sistema_lorenz, estado_inicial, t)
+        # atol pequeno: as perturbações estudadas (~1e-8) não podem se perder no erro
+        sol = solve_ivp(self._sistema_lorenz, (0, t_max), estado_inicial, method='LSODA',
+                        jac=self._jacobiano, t_eval=t, rtol=1e-8, atol=1e-10)
+        solucao = sol.y.T # (passos, 3), como no odeint
         return t, solucao
 
+    def trajetoria_soa(self, estado_inicial, t_max=100.0, passos=10000):
+        """
+        Trajetória RK4 (passo fixo) como estrutura de arrays: (t, (xs, ys, zs)),
+        cada coordenada contígua, sem o acesso estridado do formato (passos, 3).
+        """
+        t = np.linspace(0, t_max, passos)
+        x0, y0, z0 = np.asarray(estado_inicial, dtype=np.float64)
+        return t, _lorenz_rk4(x0, y0, z0, self.sigma, self.rho, self.beta, t[1] - t[0], passos)
+
     def calcular_divergencia_trajetorias(self, est_ini_1, perturbacao=1e-5, t_max=50.0):
         """
         Simula duas trajetórias muito próximas para ver a divergência.
         Demonstra o limite da previsão do tempo.
         """
-        est_ini_2 = np.array(est_ini_1) + perturbacao
+        est_ini_1 = np.asarray(est_ini_1, dtype=np.float64)
+        est_ini_2 = est_ini_1 + perturbacao
         
-        t, sol1 = self.simular_trajetoria(est_ini_1, t_max, passos=5000)
-        _, sol2 = self.simular_trajetoria(est_ini_2, t_max, passos=5000)
-        
-        # Distância Euclideana entre os estados no tempo
-        distancia = np.linalg.norm(sol1 - sol2, axis=1)
+        # RK4 fixo com as duas trajetórias no mesmo laço: só a distância
+        # Euclideana entre os estados no tempo é guardada
+        passos = 5000
+        t = np.linspace(0, t_max, passos)
+        distancia = _divergencia_rk4(est_ini_1, est_ini_2, self.sigma, self.rho, self.beta,
+                                     t[1] - t[0], passos)
         
         return t, distancia
 
@@ -78,8 +147,9 @@ class AnalisadorCaosLorenz:
         logs = np.log(distancia_tempo[mask])
         tempos = t[mask]
         
-        coefs = np.polyfit(tempos, logs, 1)
-        lambda_max = coefs[0]
+        # Inclinação da reta de mínimos quadrados em forma fechada (sem Vandermonde/SVD)
+        tc = tempos - tempos.mean()
+        lambda_max = (tc @ (logs - logs.mean())) / (tc @ tc)
         
         return lambda_max
 
@@ -87,6 +157,8 @@ class AnalisadorCaosLorenz:
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Iniciando Análise de Caos (Lorenz 1963)...")
     
     lorenz = AnalisadorCaosLorenz()
@@ -1,16 +1,67 @@
 import numpy as np
-from scipy.stats import norm
+from scipy.stats import norm, kendalltau
+from nucleo.aceleracao import njit, NUMBA_DISPONIVEL
+
+# Acima deste tamanho a matriz n x n de diferenças pesa demais na memória;
+# usa-se a contagem de inversões O(n log n) do kendalltau.
+LIMIAR_KENDALLTAU = 2000
+
+@njit(cache=True, fastmath=True)
+def _mk_s(x):
+    """Laço duplo compilado, sem alocações; (d>0)-(d<0) é o sinal sem desvio."""
+    n = x.shape[0]
+    s = 0
+    for k in range(n - 1):
+        xk = x[k]
+        for j in range(k + 1, n):
+            d = x[j] - xk
+            s += (d > 0) - (d < 0)
+    return s
+
+def _mk_s_blocos(x, bloco=256):
+    """
+    S = nº de pares crescentes - nº de pares decrescentes (empates contam 0),
+    contados com np.count_nonzero sobre máscaras de comparação. Processa
+    `bloco` linhas k por vez: só máscaras booleanas (bloco x n), nunca a
+    matriz n x n de sinais em float64.
+    """
+    n = len(x)
+    s = 0
+    for k0 in range(0, n - 1, bloco):
+        xk = x[k0:k0 + bloco, None]
+        # triu com deslocamento k0+1: só os pares j > k (k global = k0 + linha)
+        s += int(np.count_nonzero(np.triu(x[None, :] > xk, k=k0 + 1)))
+        s -= int(np.count_nonzero(np.triu(x[None, :] < xk, k=k0 + 1)))
+    return s
+
+def _estatistica_s(x):
+    """S = soma de sign(x[j] - x[k]) sobre todos os pares k < j."""
+    n = len(x)
+    if n > LIMIAR_KENDALLTAU:
+        # tau-b contra o tempo (o tempo não tem empates; os empates de x entram
+        # em n2): S = tau * sqrt(n0 * (n0 - n2)), n0 = n(n-1)/2 e
+        # n2 = soma t(t-1)/2 sobre os grupos de empates em x
+        _, t = np.unique(x, return_counts=True)
+        n0 = n * (n - 1) / 2
+        n2 = np.sum(t * (t - 1)) / 2
+        if n0 - n2 == 0: # série constante: nenhum par comparável, S = 0
+            return 0
+        tau = kendalltau(np.arange(n), x).statistic
+        if np.isnan(tau):
+            return 0
+        return int(round(tau * np.sqrt(n0 * (n0 - n2))))
+    if NUMBA_DISPONIVEL:
+        return int(_mk_s(x))
+    return _mk_s_blocos(x)
 
 def teste_mann_kendall(x, alpha=0.05):
     """
     Realiza o teste de Mann-Kendall para tendência.
     Retorna: tendência (bool), p-valor, declive de Sen.
     """
+    x = np.asarray(x, dtype=float)
     n = len(x)
-    s = 0
-    for k in range(n-1):
-        for j in range(k+1, n):
-            s += np.sign(x[j] - x[k])
+    s = _estatistica_s(x)
             
     # Variância
     var_s = (n * (n - 1) * (2 * n + 5)) / 18
@@ -22,7 +73,7 @@ def teste_mann_kendall(x, alpha=0.05):
     else:
         z = 0
         
-    p = 2 * (1 - norm.cdf(abs(z)))
+    p = 2 * norm.sf(abs(z)) # sf: exato na cauda, sem 1 - cdf
     h = abs(z) > norm.ppf(1 - alpha/2)
     
     return h, p, s
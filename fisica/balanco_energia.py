@@ -1,22 +1,31 @@
 import numpy as np
+from nucleo.aceleracao import numexpr
+
+# Acima deste nº de células a expressão é avaliada pelo numexpr (se instalado):
+# uma única passada pela memória, em blocos e em todos os núcleos.
+LIMIAR_NUMEXPR = 100_000
+EXPRESSAO_BALANCO = "S * (1 - a) - 0.2 * 5.67e-8 * (T + 273.15)**4"
 
 def calcular_balanco_energia_superficie(radiacao_solar_incidente, albedo, temperatura_superficie):
     """
     Calcula o balanço de energia simplificado na superfície.
     Rn = S_down * (1 - albedo) + L_down - L_up
-    
+
     Onde:
     L_up = sigma * T^4 (Stefan-Boltzmann)
     """
     sigma = 5.67e-8
-    
+
     # Estimativa de Radiação de Onda Longa incidente (L_down)
     # Empírico: depende da temperatura do ar e cobertura de nuvens
     # Simplificação: L_down ~ 0.8 * L_up (efeito estufa)
-    
-    l_up = sigma * (temperatura_superficie + 273.15)**4
-    l_down = 0.8 * l_up 
-    
-    radiacao_liquida = radiacao_solar_incidente * (1 - albedo) + l_down - l_up
-    
+    # Logo L_down - L_up = -0.2 * L_up: uma expressão só, sem l_up/l_down intermediários
+
+    if numexpr is not None and np.size(temperatura_superficie) >= LIMIAR_NUMEXPR:
+        return numexpr.evaluate(EXPRESSAO_BALANCO, local_dict={'S': radiacao_solar_incidente,
+                                                               'a': albedo,
+                                                               'T': temperatura_superficie})
+
+    radiacao_liquida = radiacao_solar_incidente * (1 - albedo) - 0.2 * sigma * (temperatura_superficie + 273.15)**4
+
     return radiacao_liquida
@@ -1,5 +1,6 @@
 import numpy as np
-import pandas as pd
+import math
+from nucleo.aceleracao import njit, NUMBA_DISPONIVEL
 
 """
 MÓDULO DE CAMADA LIMITE PLANETÁRIA (PBL)
@@ -27,6 +28,48 @@ Onde:
 - Gamma: Gradiente de temperatura potencial na atmosfera livre
 """
 
+@njit(cache=True)
+def _ciclo_pbl(fluxos, gradiente, dt, altura_inicial):
+    """
+    Laço compilado equivalente a chamar calcular_altura_pbl_diurna passo a passo
+    (crescimento convectivo com fluxo > 0, decaimento noturno caso contrário).
+    """
+    gradiente = max(gradiente, 0.001)
+    alturas = np.empty(fluxos.size)
+    h = altura_inicial
+    for i in range(fluxos.size):
+        fluxo = fluxos[i]
+        if fluxo <= 0:
+            h += (150.0 - h) / 7200.0 * dt
+        else:
+            dh_dt = (1 + 2 * 0.2) * fluxo / (gradiente * h)
+            h += min(0.5, max(-0.1, dh_dt)) * dt
+            h = min(3000.0, max(50.0, h))
+        alturas[i] = h
+    return alturas
+
+# Perfis verticais compilados: uma passada elemento a elemento sobre as alturas,
+# sem arrays temporários (z_safe, razões) e com o ramo da atmosfera livre por ponto.
+@njit(fastmath=True, cache=True)
+def _vento_log(z, u_star, k_von, z0):
+    zf = z.ravel()
+    out = np.empty_like(zf)
+    for i in range(zf.size):
+        out[i] = (u_star / k_von) * math.log(max(zf[i], z0 + 0.01) / z0)
+    return out.reshape(z.shape)
+
+@njit(fastmath=True, cache=True)
+def _k_obrien(z, h, w_star, k_von):
+    zf = z.ravel()
+    out = np.empty_like(zf)
+    for i in range(zf.size):
+        zi = zf[i]
+        if zi > h:
+            out[i] = 0.1 # Valor residual na atmosfera livre
+        else:
+            out[i] = max(k_von * w_star * zi * (1 - zi / h)**2, 0.1)
+    return out.reshape(z.shape)
+
 class CamadaLimite:
     def __init__(self, lat, lon):
         self.lat = lat
@@ -68,15 +111,31 @@ class CamadaLimite:
         dh_dt = forcing / (gradiente_potencial_atm_livre * self.altura_pbl)
         
         # Limitar taxa de crescimento para estabilidade numérica
-        dh_dt = np.clip(dh_dt, -0.1, 0.5) # m/s (crescimento máximo)
+        # (min/max de Python: escalares, sem o custo de despacho de um ufunc)
+        dh_dt = min(0.5, max(-0.1, dh_dt)) # m/s (crescimento máximo)
         
         self.altura_pbl += dh_dt * dt_segundos
         
         # Teto físico razoável para o Sul do Brasil
-        self.altura_pbl = np.clip(self.altura_pbl, 50, 3000)
+        self.altura_pbl = min(3000.0, max(50.0, self.altura_pbl))
         
         return self.altura_pbl
 
+    def simular_ciclo(self, fluxos_calor, gradiente_potencial_atm_livre, dt_segundos):
+        """
+        Integra uma série de fluxos de calor de uma vez (laço compilado).
+        Equivale a chamar calcular_altura_pbl_diurna para cada fluxo.
+        
+        Retorna:
+            ndarray: Altura da PBL após cada passo.
+        """
+        fluxos = np.asarray(fluxos_calor, dtype=np.float64)
+        alturas = _ciclo_pbl(fluxos, float(gradiente_potencial_atm_livre), float(dt_segundos),
+                             float(self.altura_pbl))
+        if alturas.size:
+            self.altura_pbl = alturas[-1]
+        return alturas
+
     def decaimento_noturno(self, dt):
         """
         Simula o decaimento da PBL convectiva para uma Camada Limite Estável (SBL) após o pôr do sol.
@@ -105,6 +164,11 @@ class CamadaLimite:
         Retorna:
             Velocidade do vento em m/s.
         """
+        if NUMBA_DISPONIVEL:
+            u_z = _vento_log(np.asarray(z, dtype=np.float64), float(u_star),
+                             self.constante_von_karman, self.rugosidade)
+            return u_z[()] # escalar para z escalar
+        
         # Validar z > z0
         z_safe = np.maximum(z, self.rugosidade + 0.01)
         
@@ -117,14 +181,17 @@ class CamadaLimite:
         K(z) = k * w_star * z * (1 - z/h)^2
         
         Args:
-            z (float): Altura.
+            z (float ou array): Altura(s).
             w_star (float): Escala de velocidade convectiva.
         """
-        if z > self.altura_pbl:
-            return 0.1 # Valor residual na atmosfera livre
-            
+        z = np.asarray(z, dtype=np.float64)
+        if NUMBA_DISPONIVEL:
+            k_z = _k_obrien(z, float(self.altura_pbl), float(w_star), self.constante_von_karman)
+            return k_z[()] # escalar para z escalar
+        
         k_z = self.constante_von_karman * w_star * z * (1 - z/self.altura_pbl)**2
-        return np.maximum(k_z, 0.1)
+        # Acima da PBL: valor residual na atmosfera livre
+        return np.where(z > self.altura_pbl, 0.1, np.maximum(k_z, 0.1))[()]
 
 # ==============================================================================
 # SEÇÃO DE TESTES E EXEMPLOS (SELF-TEST)
@@ -142,10 +209,6 @@ if __name__ == "__main__":
     passos = int(24 * 3600 / dt)
     tempos = np.linspace(0, 24, passos)
     
-    # Arrays para armazenar resultados
-    alturas_h = []
-    fluxos_calor = []
-    
     # Simular ciclo diurno de fluxo de calor (positivo de dia, negativo à noite)
     # Pico ao meio dia
     fluxo_max = 0.3 # K m/s (aproximadamente 300 W/m2)
@@ -153,17 +216,13 @@ if __name__ == "__main__":
     
     print(f"Simulando {passos} passos de tempo ({dt}s cada)...")
     
-    for t_hora in tempos:
-        # Fluxo solar senoidal simplificado (dia entre 6h e 18h)
-        if 6 <= t_hora <= 18:
-            fluxo = fluxo_max * np.sin(np.pi * (t_hora - 6) / 12)
-        else:
-            fluxo = -0.05 # Resfriamento noturno radiativo
-            
-        fluxos_calor.append(fluxo)
-        
-        h_atual = pbl_model.calcular_altura_pbl_diurna(fluxo, gamma, dt)
-        alturas_h.append(h_atual)
+    # Fluxo solar senoidal simplificado (dia entre 6h e 18h);
+    # resfriamento noturno radiativo fora dele
+    dia = (tempos >= 6) & (tempos <= 18)
+    fluxos_calor = np.where(dia, fluxo_max * np.sin(np.pi * (tempos - 6) / 12), -0.05)
+    
+    # Todos os passos num único laço compilado
+    alturas_h = pbl_model.simular_ciclo(fluxos_calor, gamma, dt)
         
     # Gerar Gráfico de verificação
     print("Gerando gráfico de validação interna...")
@@ -1,6 +1,5 @@
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE CONVECÇÃO E INSTABILIDADE ATMOSFÉRICA
@@ -19,6 +18,74 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Funções termodinâmicas compiladas, únicas fontes das fórmulas: usadas pelo
+# levantamento da parcela (várias vezes por nível) e pelos métodos da classe.
+# Aceitam escalares ou arrays (o Numba especializa cada tipo).
+@njit(fastmath=True, cache=True)
+def _es_tetens(temperatura_k):
+    temp_c = temperatura_k - 273.15
+    return 6.112 * np.exp((17.67 * temp_c) / (temp_c + 243.5)) # hPa
+
+@njit(fastmath=True, cache=True)
+def _ws_saturacao(pressao_hpa, temperatura_k, epsilon):
+    es = _es_tetens(temperatura_k)
+    return epsilon * (es / (pressao_hpa - es)) # kg/kg
+
+@njit(fastmath=True, cache=True)
+def _calor_latente(temperatura_k):
+    return 2.501e6 - 2370 * (temperatura_k - 273.15) # J/kg
+
+@njit(fastmath=True, cache=True)
+def _gradiente_adiabatica_umida(p, t, R_d, cp, R_v, epsilon):
+    ws = _ws_saturacao(p, t, epsilon)
+    lv = _calor_latente(t)
+    numerador = 1.0 + (lv * ws) / (R_d * t)
+    denominador = 1.0 + (lv**2 * ws) / (cp * R_v * t**2)
+    return (R_d * t / (cp * p)) * (numerador / denominador)
+
+@njit(fastmath=True, cache=True)
+def _levantar_parcela_kernel(p_superficie, t_superficie, td_superficie, perfil_p, R_d, cp, R_v, epsilon):
+    """
+    Adiabática seca até a saturação, depois úmida, nível a nível.
+    Estado da parcela: 0 = SECA, 1 = UMIDA.
+    """
+    SECA, UMIDA = 0, 1
+    t_parcela = np.empty(perfil_p.size)
+    curr_t = t_superficie
+    curr_td = td_superficie # TD varia menos com pressão na seca (mix ratio constante)
+    estado = SECA
+    # Fator de Exner (p/1000)^(R/Cp) de cada nível, calculado uma vez por perfil:
+    # a adiabática seca vira T_novo = T * pk[i] / pk[anterior], sem potências no laço
+    pk = (perfil_p / 1000.0)**0.286
+    pk_superficie = (p_superficie / 1000.0)**0.286
+    for i in range(perfil_p.size):
+        p = perfil_p[i]
+        if p >= p_superficie:
+            # Ainda na superfície ou abaixo (ignorar)
+            t_parcela[i] = curr_t
+            continue
+        
+        # Passo de pressão desde o nível anterior (o primeiro acima parte da superfície)
+        if i <= 1:
+            prev_p, pk_prev = p_superficie, pk_superficie
+        else:
+            prev_p, pk_prev = perfil_p[i - 1], pk[i - 1]
+        dp = p - prev_p # Negativo
+        
+        if estado == SECA:
+            # Adiabática Seca: Theta constante, T = T0 * (P/P0)^(R/Cp)
+            curr_t = curr_t * pk[i] / pk_prev
+            # Saturou se a razão de mistura conservada alcança a de saturação
+            if _ws_saturacao(prev_p, curr_td, epsilon) >= _ws_saturacao(p, curr_t, epsilon):
+                estado = UMIDA
+        
+        if estado == UMIDA:
+            # Adiabática Úmida: Integração numérica simplificada
+            curr_t = curr_t + _gradiente_adiabatica_umida(prev_p, curr_t, R_d, cp, R_v, epsilon) * dp
+        
+        t_parcela[i] = curr_t
+    return t_parcela
+
 class AnalisadorInstabilidade:
     def __init__(self):
         self.g = 9.81  # Gravidade (m/s^2)
@@ -29,103 +96,29 @@ class AnalisadorInstabilidade:
         
     def _pressao_vapor_saturacao(self, temperatura_k):
         """Equação de Tetens/Magnus para Es."""
-        temp_c = temperatura_k - 273.15
-        es = 6.112 * np.exp((17.67 * temp_c) / (temp_c + 243.5))
-        return es # hPa
+        return _es_tetens(temperatura_k) # hPa
 
     def _razao_mistura_saturacao(self, pressao_hpa, temperatura_k):
-        es = self._pressao_vapor_saturacao(temperatura_k)
-        ws = self.epsilon * (es / (pressao_hpa - es))
-        return ws # kg/kg
+        return _ws_saturacao(pressao_hpa, temperatura_k, self.epsilon) # kg/kg
 
     def _adiabatica_umida_gradiente(self, p, t):
         """Calcula o gradiente adiabático úmido (dT/dp)_m."""
-        ws = self._razao_mistura_saturacao(p, t)
-        
-        numerador = 1.0 + (self.bruto_calor_latente(t) * ws) / (self.R_d * t)
-        denominador = 1.0 + (self.bruto_calor_latente(t)**2 * ws) / (self.cp * self.R_v * t**2)
-        
-        dt_dp = (self.R_d * t / (self.cp * p)) * (numerador / denominador)
-        return dt_dp
+        return _gradiente_adiabatica_umida(p, t, self.R_d, self.cp, self.R_v, self.epsilon)
 
     def bruto_calor_latente(self, temp_k):
         """Calor latente de vaporização (dependente de T)."""
-        temp_c = temp_k - 273.15
-        val = 2.501e6 - 2370 * temp_c
-        return val
+        return _calor_latente(temp_k)
 
     def levantar_parcela(self, p_superficie, t_superficie, td_superficie, perfil_p):
         """
         Simula a elevação de uma parcela de ar desde a superfície.
         T_parcela segue adiabática seca até NCL, depois adiabática úmida.
+        (Laço nível a nível compilado em `_levantar_parcela_kernel`.)
         """
-        t_parcela = []
-        
-        # 1. Encontrar Nível de Condensação por Levantamento (LCL)
-        # Aproximação de Espy
-        ts_c = t_superficie - 273.15
-        td_c = td_superficie - 273.15
-        t_lcl_c = td_c - (0.0024 * (ts_c - td_c)) # Em T, não Z
-        # Mas precisamos da Pressão do LCL
-        # T_lcl = T_sfc - 9.8 * z_lcl (aproximadamente)
-        # Melhor usar iterativo simples:
-        
-        curr_t = t_superficie
-        curr_td = td_superficie # TD varia menos com pressão na seca (mix ratio constante)
-        
-        # Estado atual da parcela
-        estado = "SECA"
-        
-        t_parcela_vals = []
-        
         # Assumindo perfil_p ordenado decrescente (superficie -> topo)
-        for p in perfil_p:
-            if p >= p_superficie:
-                # Ainda na superfície ou abaixo (ignorar)
-                t_parcela_vals.append(curr_t) # Placeholder ou real T
-                continue
-                
-            # Calcular passo de pressão
-            # Nota: Implementação rigorosa exigiria integração fina step-by-step
-            # Aqui vamos fazer uma aproximação baseada em intervalos do perfil fornecido
-            
-            # Se for o primeiro nivel acima da sup, aproximar
-            prev_p = p_superficie if len(t_parcela_vals) <= 1 else perfil_p[len(t_parcela_vals)-1]
-            dp = p - prev_p # Negativo
-            
-            if estado == "SECA":
-                # Adiabática Seca: Theta constante
-                # T = T0 * (P/P0)^(R/Cp)
-                t_pot = curr_t * (1000/prev_p)**0.286
-                new_t = t_pot * (p/1000)**0.286
-                
-                # Check saturação (T_parc < T_dewpoint?)
-                # Dewpoint na adiabática seca cai ~2K/km, Tparcela cai ~10K/km
-                # Razão de mistura w é constante
-                # w = w_sfc
-                w_parc = self._razao_mistura_saturacao(prev_p, curr_td) # w conservado
-                ws_at_new_t = self._razao_mistura_saturacao(p, new_t)
-                
-                if w_parc >= ws_at_new_t:
-                    estado = "UMIDA"
-                    curr_t = new_t # Ponto de cruzamento
-                else:
-                    curr_t = new_t
-            
-            if estado == "UMIDA":
-                # Adiabática Úmida: Integração numérica simplificada
-                dt_dp = self._adiabatica_umida_gradiente(prev_p, curr_t)
-                curr_t = curr_t + dt_dp * dp
-                
-            t_parcela_vals.append(curr_t)
-            
-        # Ajustar comprimento
-        # Como loop acima pode pular p_superficie se não estiver na lista exata
-        # Vamos fazer interpolação se necessário
-        # Para simplificar este código demonstrativo, retornamos array de mesmo tamanho
-        # Assumindo que perfil_p começa em p_sup
-        
-        return np.array(t_parcela_vals)
+        perfil_p = np.ascontiguousarray(perfil_p, dtype=np.float64)
+        return _levantar_parcela_kernel(float(p_superficie), float(t_superficie), float(td_superficie),
+                                        perfil_p, self.R_d, self.cp, self.R_v, self.epsilon)
 
     def calcular_cape_cin(self, perfil_p, perfil_t_amb, perfil_t_parc):
         """
@@ -137,32 +130,26 @@ class AnalisadorInstabilidade:
         
         Simplificação: CAPE = Soma [ R_d * (Tp - Te) * ln(p1/p2) ] para camadas onde Tp > Te
         """
-        cape = 0.0
-        cin = 0.0
+        perfil_p = np.asarray(perfil_p, dtype=np.float64)
+        perfil_t_amb = np.asarray(perfil_t_amb, dtype=np.float64)
+        perfil_t_parc = np.asarray(perfil_t_parc, dtype=np.float64)
+        
+        # Todas as camadas de uma vez: médias de camada e espessura em log-p
+        p1 = perfil_p[:-1]
+        p2 = perfil_p[1:] # menor que p1
+        tp_mean = 0.5 * (perfil_t_parc[:-1] + perfil_t_parc[1:])
+        te_mean = 0.5 * (perfil_t_amb[:-1] + perfil_t_amb[1:])
         
-        for i in range(len(perfil_p) - 1):
-            p1 = perfil_p[i]
-            p2 = perfil_p[i+1] # menor que p1
-            
-            # Camada média
-            tp_mean = (perfil_t_parc[i] + perfil_t_parc[i+1]) / 2.0
-            te_mean = (perfil_t_amb[i] + perfil_t_amb[i+1]) / 2.0
-            
-            # Se Tp > Te -> Empuxo positivo (CAPE)
-            # Se Tp < Te -> Empuxo negativo (CIN)
-            
-            dif_t = tp_mean - te_mean
-            
-            # Log pressure thickness
-            d_ln_p = np.log(p1 / p2) # Positivo pois p1 > p2
-            
-            # Energia da camada (J/kg)
-            energia = self.R_d * dif_t * d_ln_p
-            
-            if dif_t > 0:
-                cape += energia
-            else:
-                cin += abs(energia) # CIN geralmente expresso como positivo ou negativo, aqui magnitude
+        # Se Tp > Te -> Empuxo positivo (CAPE)
+        # Se Tp < Te -> Empuxo negativo (CIN)
+        dif_t = tp_mean - te_mean
+        
+        # Energia da camada (J/kg); ln(p1/p2) positivo pois p1 > p2
+        energia = self.R_d * dif_t * np.log(p1 / p2)
+        
+        positivo = dif_t > 0
+        cape = energia[positivo].sum()
+        cin = np.abs(energia[~positivo]).sum() # CIN geralmente expresso como positivo ou negativo, aqui magnitude
                 
         return cape, cin
 
@@ -183,6 +170,8 @@ class AnalisadorInstabilidade:
 # SELF-TEST
 # ==============================================================================
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt # só o self-test plota
+    
     print("Iniciando Análise de Instabilidade (CAPE/CIN)...")
     
     analisador = AnalisadorInstabilidade()
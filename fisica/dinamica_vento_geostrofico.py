@@ -1,24 +1,39 @@
 import numpy as np
+from fisica.adveccao_termica import derivada_centrada
+
+class OperadorVentoGeostrofico:
+    """
+    Vento geostrófico para uma latitude (ou grade de latitudes) fixa.
+    O fator 1 / (rho * f), com o seno da latitude, é calculado uma vez na
+    construção; cada chamada só diferencia a pressão e multiplica.
+    """
+    def __init__(self, latitude, rho=1.225):
+        omega = 7.2921e-5
+        
+        # Calcular parâmetro de Coriolis (f)
+        # Latitude média do Sul do Brasil ~ 25-30S (negativo)
+        # Mas usaremos magnitude para calculo escalar simplificado
+        lat_rad = np.radians(np.abs(latitude))
+        f = 2 * omega * np.sin(lat_rad)
+        self._coef = 1 / (rho * f)
+        
+    def __call__(self, pressao, dx, dy):
+        """Retorna (Ug, Vg) em m/s para um campo de pressão em hPa."""
+        # dP/dx, dP/dy em Pa/m (hPa -> Pa)
+        dp_dx = derivada_centrada(pressao, dx, eixo=1) * 100
+        dp_dy = derivada_centrada(pressao, dy, eixo=0) * 100
+        
+        ug = - self._coef * dp_dy
+        vg = self._coef * dp_dx
+        
+        return ug, vg
 
 def calcular_vento_geostrofico(pressao, latitude, dx, dy):
     """
     Calcula o vento geostrófico (Ug, Vg) a partir do campo de pressão.
     Ug = - (1 / (rho * f)) * dP/dy
     Vg = (1 / (rho * f)) * dP/dx
-    """
-    omega = 7.2921e-5
-    rho = 1.225
     
-    # Calcular parâmetro de Coriolis (f)
-    # Latitude média do Sul do Brasil ~ 25-30S (negativo)
-    # Mas usaremos magnitude para calculo escalar simplificado
-    lat_rad = np.radians(np.abs(latitude))
-    f = 2 * omega * np.sin(lat_rad)
-    
-    dp_dx = np.gradient(pressao, dx, axis=1) * 100 # hPa to Pa
-    dp_dy = np.gradient(pressao, dy, axis=0) * 100
-    
-    ug = - (1 / (rho * f)) * dp_dy
-    vg = (1 / (rho * f)) * dp_dx
-    
-    return ug, vg
+    Para vários campos na mesma latitude, reutilize um OperadorVentoGeostrofico.
+    """
+    return OperadorVentoGeostrofico(latitude)(pressao, dx, dy)
@@ -1,4 +1,5 @@
 import numpy as np
+from fisica.adveccao_termica import calcular_adveccao_termica
 
 def estimar_velocidade_vertical_omega(vorticidade_adveccao, adveccao_termica_laplaciano):
     """
@@ -13,3 +14,19 @@ def estimar_velocidade_vertical_omega(vorticidade_adveccao, adveccao_termica_lap
     
     omega_force = -vorticidade_adveccao - adveccao_termica_laplaciano
     return omega_force
+
+def estimar_omega_campos(vorticidade_adveccao, temperatura, vento_u, vento_v, dx, dy):
+    """
+    Mesma forçante da equação omega, a partir dos campos brutos de temperatura
+    e vento: a advecção térmica vem do estêncil compilado de adveccao_termica e
+    o seu Laplaciano de 5 pontos é aplicado direto nas sub-vistas do interior
+    (bordas sem forçante térmica), sem cadeias de np.gradient no chamador.
+    """
+    adv = calcular_adveccao_termica(temperatura, vento_u, vento_v, dx, dy)
+    
+    laplaciano = np.zeros_like(adv)
+    centro = adv[1:-1, 1:-1]
+    laplaciano[1:-1, 1:-1] = (adv[1:-1, 2:] - 2*centro + adv[1:-1, :-2]) / dx**2 + \
+                             (adv[2:, 1:-1] - 2*centro + adv[:-2, 1:-1]) / dy**2
+    
+    return estimar_velocidade_vertical_omega(vorticidade_adveccao, laplaciano)
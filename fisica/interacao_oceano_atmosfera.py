@@ -1,5 +1,9 @@
 import numpy as np
 
+# Frequências angulares do ONI simulado (rad/ano): ciclos de ~4 e ~11 anos
+_W_ENSO = 2 * np.pi / 4.0
+_W_DECADAL = 2 * np.pi / 11.0
+
 def acoplamento_termico_oceano(temp_ar, temp_oceano, velocidade_vento):
     """
     Calcula o fluxo de calor sensível entre oceano e atmosfera usando fórmula bulk.
@@ -15,8 +19,10 @@ def acoplamento_termico_oceano(temp_ar, temp_oceano, velocidade_vento):
 def indice_oni_simulado(ano, mes):
     """
     Retorna um índice ONI (Oceanic Nino Index) simulado para o ano/mês.
+    Aceita escalares ou arrays (ano e mes com broadcast): uma série inteira
+    é gerada numa única chamada vetorizada.
     """
-    t = ano + (mes/12.0)
+    t = np.asarray(ano, dtype=np.float64) + np.asarray(mes) / 12.0
     # Ciclo irregular de ~4 anos
-    valor = 1.5 * np.sin(2 * np.pi * t / 4) + 0.5 * np.sin(2 * np.pi * t / 11)
+    valor = 1.5 * np.sin(_W_ENSO * t) + 0.5 * np.sin(_W_DECADAL * t)
     return valor
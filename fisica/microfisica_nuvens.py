@@ -5,9 +5,10 @@ def parametrizar_nucleacao(umidade_relativa, aerossois_conc):
     Modelo simples de ativação de CCN (Cloud Condensation Nuclei).
     N_act = C * (S)^(k)
     """
-    supersaturacao = np.maximum(0, umidade_relativa - 100.0) / 100.0
+    # Supersaturação em % (já >= 0): 0**k = 0 dispensa a máscara do np.where,
+    # e sem o /100 seguido de *100
+    supersaturacao_pct = np.maximum(0.0, umidade_relativa - 100.0)
     c_param = 100.0 # Exemplo
     k_param = 0.7
     
-    n_gotas = c_param * (supersaturacao * 100) ** k_param
-    return np.where(supersaturacao > 0, n_gotas, 0)
+    return c_param * supersaturacao_pct ** k_param
@@ -1,5 +1,7 @@
 import numpy as np
+from scipy import fft
 import matplotlib.pyplot as plt
+from nucleo.aceleracao import njit, prange, NUMBA_DISPONIVEL, cupy
 
 """
 MÓDULO DE DINÂMICA DE FLUIDOS COMPUTACIONAL (CFD)
@@ -10,7 +12,7 @@ Essencial para modelar o movimento do ar na microescala ou mesoescala dentro do
 
 Método: Projeção de Chorin (Fractional Step Method).
 1. Advecção-Difusão (Passo Provisório para Velocidade*)
-2. Equação de Poisson para Pressão
+2. Equação de Poisson para Pressão (solução espectral exata, contorno periódico)
 3. Correção de Velocidade (Projeção)
 
 Equações:
@@ -21,8 +23,95 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Estênceis compilados (contorno periódico por índice modular, como np.roll):
+# uma passada por ponto, linhas em paralelo, sem arrays temporários.
+@njit(parallel=True, fastmath=True, cache=True)
+def _adveccao_kernel(f, u, v, dx, dy, out):
+    """Advecção upwind de primeira ordem: -(u * df/dx + v * df/dy)."""
+    ny, nx = f.shape
+    for i in prange(ny):
+        im1 = (i - 1) % ny
+        ip1 = (i + 1) % ny
+        for j in range(nx):
+            jm1 = (j - 1) % nx
+            jp1 = (j + 1) % nx
+            fc = f[i, j]
+            df_dx = (fc - f[i, jm1]) / dx if u[i, j] > 0 else (f[i, jp1] - fc) / dx
+            df_dy = (fc - f[im1, j]) / dy if v[i, j] > 0 else (f[ip1, j] - fc) / dy
+            out[i, j] = -(u[i, j] * df_dx + v[i, j] * df_dy)
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _laplaciano_kernel(f, inv_dx2, inv_dy2, out):
+    """Laplaciano de 5 pontos (diferenças centradas)."""
+    ny, nx = f.shape
+    for i in prange(ny):
+        im1 = (i - 1) % ny
+        ip1 = (i + 1) % ny
+        for j in range(nx):
+            fc2 = 2 * f[i, j]
+            out[i, j] = (f[i, (j - 1) % nx] - fc2 + f[i, (j + 1) % nx]) * inv_dx2 + \
+                        (f[im1, j] - fc2 + f[ip1, j]) * inv_dy2
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _divergencia_kernel(u, v, inv_2dx, inv_2dy, out):
+    """div(u) por diferenças centradas."""
+    ny, nx = u.shape
+    for i in prange(ny):
+        im1 = (i - 1) % ny
+        ip1 = (i + 1) % ny
+        for j in range(nx):
+            out[i, j] = (u[i, (j + 1) % nx] - u[i, (j - 1) % nx]) * inv_2dx + \
+                        (v[ip1, j] - v[im1, j]) * inv_2dy
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _projecao_kernel(u_star, v_star, p, u_out, v_out, inv_2dx, inv_2dy, coef):
+    """
+    Projeção fundida: grad(p) centrado e u = u* - coef * grad(p) numa passada.
+    Cada ponto só lê u*[i, j], então u_out pode ser o próprio u* (no lugar).
+    """
+    ny, nx = p.shape
+    for i in prange(ny):
+        im1 = (i - 1) % ny
+        ip1 = (i + 1) % ny
+        for j in range(nx):
+            dp_dx = (p[i, (j + 1) % nx] - p[i, (j - 1) % nx]) * inv_2dx
+            dp_dy = (p[ip1, j] - p[im1, j]) * inv_2dy
+            u_out[i, j] = u_star[i, j] - coef * dp_dx
+            v_out[i, j] = v_star[i, j] - coef * dp_dy
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _passo_provisorio_kernel(u, v, fx, fy, inv_dx, inv_dy, cx, cy, dt, u_star, v_star):
+    """
+    Passo provisório fundido: advecção upwind, difusão (cx = nu/dx^2,
+    cy = nu/dy^2) e forçante de u e v numa única passada:
+        u* = u + dt * (adv(u) + nu * lap(u) + fx)
+    """
+    ny, nx = u.shape
+    for i in prange(ny):
+        im1 = (i - 1) % ny
+        ip1 = (i + 1) % ny
+        for j in range(nx):
+            jm1 = (j - 1) % nx
+            jp1 = (j + 1) % nx
+            uc = u[i, j]
+            vc = v[i, j]
+            # u
+            ddx = (uc - u[i, jm1]) * inv_dx if uc > 0 else (u[i, jp1] - uc) * inv_dx
+            ddy = (uc - u[im1, j]) * inv_dy if vc > 0 else (u[ip1, j] - uc) * inv_dy
+            lap = (u[i, jm1] - 2*uc + u[i, jp1]) * cx + (u[im1, j] - 2*uc + u[ip1, j]) * cy
+            u_star[i, j] = uc + dt * (-(uc * ddx + vc * ddy) + lap + fx[i, j])
+            # v
+            ddx = (vc - v[i, jm1]) * inv_dx if uc > 0 else (v[i, jp1] - vc) * inv_dx
+            ddy = (vc - v[im1, j]) * inv_dy if vc > 0 else (v[ip1, j] - vc) * inv_dy
+            lap = (v[i, jm1] - 2*vc + v[i, jp1]) * cx + (v[im1, j] - 2*vc + v[ip1, j]) * cy
+            v_star[i, j] = vc + dt * (-(uc * ddx + vc * ddy) + lap + fy[i, j])
+
 class NavierStokesSolver:
-    def __init__(self, nx=50, ny=50, lx=10000.0, ly=10000.0, nu=10.0, rho=1.225, dt=1.0):
+    def __init__(self, nx=50, ny=50, lx=10000.0, ly=10000.0, nu=10.0, rho=1.225, dt=1.0,
+                 dtype=np.float32, usar_gpu=False):
         """
         Args:
             nx, ny: Pontos de grade.
@@ -30,6 +119,11 @@ class NavierStokesSolver:
             nu: Viscosidade cinemática (m^2/s).
             rho: Densidade do ar (kg/m^3).
             dt: Passo de tempo (s).
+            dtype: Precisão dos campos. float32 basta para vento de mesoescala e
+                   reduz à metade os bytes movidos pelos estênceis (limitados por memória).
+            usar_gpu: Mantém os campos na GPU (CuPy) e roda o passo com o caminho
+                      vetorizado e cuFFT. Compensa em grades grandes (> 256x256);
+                      sem CuPy instalado o solver fica na CPU.
         """
         self.nx = nx
         self.ny = ny
@@ -38,98 +132,183 @@ class NavierStokesSolver:
         self.nu = nu
         self.rho = rho
         self.dt = dt
+        self.dtype = dtype
+        
+        # Módulo de arrays (numpy ou cupy) e de FFT; os kernels Numba só valem na CPU
+        if usar_gpu and cupy is not None:
+            import cupyx.scipy.fft
+            self.xp = cupy
+            self._fft = cupyx.scipy.fft
+            self._fft_kwargs = {} # planos cuFFT ficam no cache de planos do CuPy
+        else:
+            self.xp = np
+            self._fft = fft
+            self._fft_kwargs = {'workers': -1}
+        self._compilado = NUMBA_DISPONIVEL and self.xp is np
+        xp = self.xp
         
         # Campos (u, v, p)
-        self.u = np.zeros((ny, nx))
-        self.v = np.zeros((ny, nx))
-        self.p = np.zeros((ny, nx))
+        self.u = xp.zeros((ny, nx), dtype=dtype)
+        self.v = xp.zeros((ny, nx), dtype=dtype)
+        self.p = xp.zeros((ny, nx), dtype=dtype)
         
         # Termos forçantes (ex: Coriolis na escala maior, aqui simplificado)
-        self.fx = np.zeros((ny, nx))
-        self.fy = np.zeros((ny, nx))
+        self.fx = xp.zeros((ny, nx), dtype=dtype)
+        self.fy = xp.zeros((ny, nx), dtype=dtype)
+        
+        # Buffers de saída dos estênceis compilados (reutilizados a cada passo:
+        # o resultado deve ser consumido antes da próxima chamada)
+        self._adv_buf = xp.empty((ny, nx), dtype=dtype)
+        self._lap_buf = xp.empty((ny, nx), dtype=dtype)
+        self._div_buf = xp.empty((ny, nx), dtype=dtype)
+        # Buffers de trabalho do passo: velocidades provisórias (trocadas com
+        # u, v ao fim de cada passo) e rascunho do gradiente de pressão
+        self._u_star = xp.empty((ny, nx), dtype=dtype)
+        self._v_star = xp.empty((ny, nx), dtype=dtype)
+        self._dp_buf = xp.empty((ny, nx), dtype=dtype)
+        
+        # Índices dos vizinhos no domínio periódico (equivalem a np.roll(f, -1/+1)),
+        # calculados uma vez e compartilhados pelos estênceis do caminho NumPy
+        self._ip1_x = xp.roll(xp.arange(nx), -1)
+        self._im1_x = xp.roll(xp.arange(nx), 1)
+        self._ip1_y = xp.roll(xp.arange(ny), -1)
+        self._im1_y = xp.roll(xp.arange(ny), 1)
+        
+        self._construir_simbolo_poisson()
+
+    def _construir_simbolo_poisson(self):
+        """
+        Autovalores do Laplaciano discreto de 5 pontos com contorno periódico:
+        a FFT 2D diagonaliza o operador, -(2 sin(pi k/n) / d)^2 por eixo.
+        Só depende da grade, então é calculado uma vez (eixo x na metade rfft).
+        """
+        xp = self.xp
+        kx2 = (2 * xp.sin(np.pi * self._fft.rfftfreq(self.nx)) / self.dx)**2
+        ky2 = (2 * xp.sin(np.pi * self._fft.fftfreq(self.ny)) / self.dy)**2
+        self.simbolo_laplaciano = -(kx2[None, :] + ky2[:, None]).astype(self.dtype)
+        self.simbolo_laplaciano[0, 0] = 1.0 # modo médio: evita divisão por zero
 
     def _laplaciano(self, f):
         """Calcula Laplaciano discreto (diferenças finitas centradas)."""
-        lap = (np.roll(f, 1, axis=1) - 2*f + np.roll(f, -1, axis=1)) / self.dx**2 + \
-              (np.roll(f, 1, axis=0) - 2*f + np.roll(f, -1, axis=0)) / self.dy**2
+        if self._compilado:
+            return _laplaciano_kernel(f, 1.0 / self.dx**2, 1.0 / self.dy**2, self._lap_buf)
+        
+        lap = (f[:, self._im1_x] - 2*f + f[:, self._ip1_x]) / self.dx**2 + \
+              (f[self._im1_y] - 2*f + f[self._ip1_y]) / self.dy**2
         return lap
 
     def _adveccao(self, f, u, v):
         """Termo não-linear de advecção: -(u * df/dx + v * df/dy)."""
+        if self._compilado:
+            return _adveccao_kernel(f, u, v, self.dx, self.dy, self._adv_buf)
+        
         # Upwind ou centrada? Usando centrada simples para demonstração (instável sem viscosidade alta)
         # Melhor usar Upwind de primeira ordem para estabilidade em código simples
         
         # Vento positivo (fluxo da esquerda/baixo) usa vizinho anterior
-        df_dx = np.zeros_like(f)
-        df_dy = np.zeros_like(f)
+        xp = self.xp
+        df_dx = xp.zeros_like(f)
+        df_dy = xp.zeros_like(f)
         
         # Discretização Upwind manual
         # X direction
-        flux_x_pos = (f - np.roll(f, 1, axis=1)) / self.dx
-        flux_x_neg = (np.roll(f, -1, axis=1) - f) / self.dx
-        df_dx = np.where(u > 0, flux_x_pos, flux_x_neg)
+        flux_x_pos = (f - f[:, self._im1_x]) / self.dx
+        flux_x_neg = (f[:, self._ip1_x] - f) / self.dx
+        df_dx = xp.where(u > 0, flux_x_pos, flux_x_neg)
         
         # Y direction
-        flux_y_pos = (f - np.roll(f, 1, axis=0)) / self.dy
-        flux_y_neg = (np.roll(f, -1, axis=0) - f) / self.dy
-        df_dy = np.where(v > 0, flux_y_pos, flux_y_neg)
+        flux_y_pos = (f - f[self._im1_y]) / self.dy
+        flux_y_neg = (f[self._ip1_y] - f) / self.dy
+        df_dy = xp.where(v > 0, flux_y_pos, flux_y_neg)
         
         term = - (u * df_dx + v * df_dy)
         return term
 
-    def resolver_poisson_pressao(self, div_u_star, nit=50):
+    def resolver_poisson_pressao(self, div_u_star):
         """
-        Resolve laplaciano(p) = rho/dt * div(u*) usando Jacobi Iterativo.
-        Computacionalmente intensivo (simula carga de HPC).
+        Resolve laplaciano(p) = rho/dt * div(u*) no espaço de Fourier.
+        Contorno periódico (como o resto do solver): uma FFT direta,
+        divisão pelo símbolo do Laplaciano e uma FFT inversa dão a solução exata
+        do sistema discreto, no lugar de dezenas de varreduras de Jacobi.
+        A pressão é definida a menos de uma constante: fixa-se média zero.
         """
-        rhs = (self.rho / self.dt) * div_u_star
-        p_new = np.zeros_like(self.p)
-        
-        for _ in range(nit):
-            p_new[1:-1, 1:-1] = (
-                (self.p[1:-1, 2:] + self.p[1:-1, :-2]) * self.dy**2 +
-                (self.p[2:, 1:-1] + self.p[:-2, 1:-1]) * self.dx**2 -
-                rhs[1:-1, 1:-1] * self.dx**2 * self.dy**2
-            ) / (2 * (self.dx**2 + self.dy**2))
-            
-            # Condições de Contorno (Neumann dp/dn = 0 nas paredes)
-            p_new[:, 0] = p_new[:, 1]
-            p_new[:, -1] = p_new[:, -2]
-            p_new[0, :] = p_new[1, :]
-            p_new[-1, :] = p_new[-2, :]
-            
-            self.p = p_new.copy()
+        rhs = (self.rho / self.dt) * self.xp.asarray(div_u_star, dtype=self.dtype)
+        p_hat = self._fft.rfft2(rhs, **self._fft_kwargs)
+        p_hat /= self.simbolo_laplaciano
+        p_hat[0, 0] = 0.0
+        self.p = self._fft.irfft2(p_hat, s=(self.ny, self.nx), **self._fft_kwargs)
             
     def passo_tempo(self):
-        """Executa um passo completo do algoritmo de projeção."""
+        """
+        Executa um passo completo do algoritmo de projeção.
+        
+        Os campos retornados são os próprios buffers do solver (alternados a
+        cada passo, sem alocação): copie-os para guardar um histórico.
+        """
+        xp = self.xp
+        u_star = self._u_star
+        v_star = self._v_star
         
         # 1. Passo Provisório (Tentativa de velocidade sem pressão)
         # u* = u + dt * (Advecção + Difusão + Forças)
-        adv_u = self._adveccao(self.u, self.u, self.v)
-        dif_u = self.nu * self._laplaciano(self.u)
-        u_star = self.u + self.dt * (adv_u + dif_u + self.fx)
-        
-        adv_v = self._adveccao(self.v, self.u, self.v)
-        dif_v = self.nu * self._laplaciano(self.v)
-        v_star = self.v + self.dt * (adv_v + dif_v + self.fy)
+        if self._compilado:
+            _passo_provisorio_kernel(self.u, self.v, np.broadcast_to(self.fx, self.u.shape),
+                                     np.broadcast_to(self.fy, self.v.shape),
+                                     1.0 / self.dx, 1.0 / self.dy,
+                                     self.nu / self.dx**2, self.nu / self.dy**2, float(self.dt),
+                                     u_star, v_star)
+        else:
+            # Mesma ordem de operações de u + dt * (adv + dif + fx), acumulada no buffer
+            xp.multiply(self.nu, self._laplaciano(self.u), out=u_star)
+            u_star += self._adveccao(self.u, self.u, self.v)
+            u_star += self.fx
+            u_star *= self.dt
+            u_star += self.u
+            
+            xp.multiply(self.nu, self._laplaciano(self.v), out=v_star)
+            v_star += self._adveccao(self.v, self.u, self.v)
+            v_star += self.fy
+            v_star *= self.dt
+            v_star += self.v
         
         # Condições de Contorno de u*, v* (Paredes fechadas ou periódico?)
         # Vamos assumir periódico para simplificar índices
         
         # 2. Equação de Poisson para Pressão
         # div(u*)
-        div_u_star = (np.roll(u_star, -1, axis=1) - np.roll(u_star, 1, axis=1)) / (2*self.dx) + \
-                     (np.roll(v_star, -1, axis=0) - np.roll(v_star, 1, axis=0)) / (2*self.dy)
+        if self._compilado:
+            div_u_star = _divergencia_kernel(u_star, v_star, 0.5 / self.dx, 0.5 / self.dy,
+                                             self._div_buf)
+        else:
+            div_u_star = self._div_buf
+            aux = self._dp_buf # rascunho (a pressão ainda não foi calculada)
+            xp.subtract(u_star[:, self._ip1_x], u_star[:, self._im1_x], out=div_u_star)
+            div_u_star /= 2*self.dx
+            xp.subtract(v_star[self._ip1_y], v_star[self._im1_y], out=aux)
+            aux /= 2*self.dy
+            div_u_star += aux
                      
         self.resolver_poisson_pressao(div_u_star)
         
         # 3. Correção de Velocidade (Projeção)
-        # u_new = u* - dt/rho * grad(p)
-        dp_dx = (np.roll(self.p, -1, axis=1) - np.roll(self.p, 1, axis=1)) / (2*self.dx)
-        dp_dy = (np.roll(self.p, -1, axis=0) - np.roll(self.p, 1, axis=0)) / (2*self.dy)
+        # u_new = u* - dt/rho * grad(p), escrito no lugar sobre u*, v*
+        if self._compilado:
+            _projecao_kernel(u_star, v_star, self.p, u_star, v_star,
+                             0.5 / self.dx, 0.5 / self.dy, self.dt / self.rho)
+        else:
+            dp = self._dp_buf
+            xp.subtract(self.p[:, self._ip1_x], self.p[:, self._im1_x], out=dp)
+            dp /= 2*self.dx
+            dp *= self.dt / self.rho
+            u_star -= dp
+            xp.subtract(self.p[self._ip1_y], self.p[self._im1_y], out=dp)
+            dp /= 2*self.dy
+            dp *= self.dt / self.rho
+            v_star -= dp
         
-        self.u = u_star - (self.dt / self.rho) * dp_dx
-        self.v = v_star - (self.dt / self.rho) * dp_dy
+        # Troca de buffers: u* vira o campo atual e o campo antigo recebe o próximo u*
+        self._u_star, self.u = self.u, u_star
+        self._v_star, self.v = self.v, v_star
         
         return self.u, self.v, self.p
 
@@ -1,5 +1,22 @@
 import numpy as np
 
+class OperadorOndaRossby:
+    """
+    Velocidade de fase das ondas de Rossby para uma latitude fixa: o fator
+    beta / (4 pi^2), com o cosseno da latitude, é calculado uma vez.
+    """
+    def __init__(self, latitude, u_medio=10.0):
+        omega = 7.2921e-5
+        raio_terra = 6.371e6
+        lat_rad = np.radians(latitude)
+        
+        beta = (2 * omega * np.cos(lat_rad)) / raio_terra
+        self._fator = beta / (4 * np.pi**2)
+        self.u_medio = u_medio # m/s (Oeste para Leste)
+        
+    def __call__(self, comprimento_onda):
+        return self.u_medio - self._fator * comprimento_onda**2
+
 def simulacao_onda_rossby_simplificada(latitude, comprimento_onda):
     """
     Calcula a velocidade de fase das ondas de Rossby (Ondas Planetárias).
@@ -8,14 +25,7 @@ def simulacao_onda_rossby_simplificada(latitude, comprimento_onda):
     Onde:
     U = vento médio zonal (Westerly)
     beta = df/dy (variação de Coriolis com latitude)
-    """
-    omega = 7.2921e-5
-    raio_terra = 6.371e6
-    lat_rad = np.radians(latitude)
     
-    beta = (2 * omega * np.cos(lat_rad)) / raio_terra
-    
-    u_medio = 10.0 # m/s (Oeste para Leste)
-    
-    c = u_medio - (beta * comprimento_onda**2) / (4 * np.pi**2)
-    return c
+    Para vários comprimentos de onda na mesma latitude, reutilize um OperadorOndaRossby.
+    """
+    return OperadorOndaRossby(latitude)(comprimento_onda)
@@ -1,6 +1,5 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.special import expn # Exponencial integral para transferência radiativa
 
 """
 MÓDULO DE TRANSFERÊNCIA RADIATIVA ATMOSFÉRICA
@@ -75,14 +74,26 @@ class ModeloRadiacao:
         # Usando transmissividade T = exp(-1.66 * dtau) (Fator de difusividade 1.66)
         transmissividade = np.exp(-1.66 * d_tau)
         emissividade = 1.0 - transmissividade
+        fonte = B_layer * emissividade
         
-        for i in range(n-1):
-            flux_down[i+1] = flux_down[i] * transmissividade[i] + B_layer[i] * emissividade[i]
-            
-        # Integração Ascendente (Upwards)
-        # Começa da superfície (índice -1) para cima
-        for i in range(n-2, -1, -1):
-            flux_up[i] = flux_up[i+1] * transmissividade[i] + B_layer[i] * emissividade[i]
+        # As recorrências F(i+1) = F(i)*T(i) + fonte(i) têm forma fechada em termos
+        # da espessura óptica acumulada a (produto das T = exp(-diferença de a)):
+        #   F_down(k) = exp(-a_k) * soma_{i<k} fonte_i * exp(a_{i+1})
+        #   F_up(k)   = exp(a_k) * [F_up(sup) * exp(-a_sup) + soma_{i>=k} fonte_i * exp(-a_i)]
+        # Somas acumuladas no lugar dos dois laços camada a camada.
+        a = np.concatenate(([0.0], np.cumsum(1.66 * d_tau)))
+        if a[-1] < 700: # exp(+-a) representável em float64 (coluna real: a ~ O(1))
+            # Uma única exponencial por interface, reutilizada nas duas varreduras
+            ea = np.exp(a)
+            flux_down[1:] = np.cumsum(fonte * ea[1:]) / ea[1:]
+            acumulado = np.cumsum((fonte / ea[:-1])[::-1])[::-1]
+            flux_up[:-1] = ea[:-1] * (flux_up[-1] / ea[-1] + acumulado)
+        else:
+            for i in range(n-1):
+                flux_down[i+1] = flux_down[i] * transmissividade[i] + fonte[i]
+            # Começa da superfície (índice -1) para cima
+            for i in range(n-2, -1, -1):
+                flux_up[i] = flux_up[i+1] * transmissividade[i] + fonte[i]
             
         flux_net = flux_up - flux_down
         
@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from nucleo.aceleracao import njit, NUMBA_DISPONIVEL
 
 """
 MÓDULO DE TURBULÊNCIA ATMOSFÉRICA
@@ -15,6 +16,25 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+_MAIOR_FLOAT = np.finfo(np.float64).max
+
+# error_model='numpy': divisão por zero segue IEEE (inf/nan) em vez de levantar
+# exceção, para reproduzir exatamente o np.nan_to_num do caminho NumPy
+@njit(cache=True, error_model='numpy')
+def _tke_passo(k, eps, u_shear, buoyancy, dt, c_mu, out_k, out_nut):
+    """Passo de Euler da TKE ponto a ponto, sem arrays temporários."""
+    for i in range(k.size):
+        nut = c_mu * (k[i] * k[i]) / eps[i]
+        if nut != nut: # nan (0/0): valor de segurança
+            nut = 0.1
+        elif nut > _MAIOR_FLOAT:
+            nut = _MAIOR_FLOAT
+        elif nut < -_MAIOR_FLOAT:
+            nut = -_MAIOR_FLOAT
+        k_novo = k[i] + (nut * u_shear[i] - nut * buoyancy[i] - eps[i]) * dt
+        out_k[i] = max(k_novo, 1e-4)
+        out_nut[i] = nut
+
 class ModeloTurbulenciaTKE:
     def __init__(self, c_mu=0.09):
         # Constantes do modelo k-epsilon padrão
@@ -39,6 +59,18 @@ class ModeloTurbulenciaTKE:
         # Produção Mecânica (Shear) P = nu_t * (du/dz)^2
         # Viscosidade turbulenta nu_t = C_mu * k^2 / eps
         
+        if NUMBA_DISPONIVEL:
+            # Atualização inteira fundida num laço compilado (perfis curtos:
+            # o custo seria o despacho de ~10 operações NumPy por passo)
+            campos = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64)
+                                           for c in (k, eps, u_shear, buoyancy)))
+            k_, eps_, shear_, buoy_ = (np.ascontiguousarray(c).ravel() for c in campos)
+            k_novo = np.empty_like(k_)
+            nu_t = np.empty_like(k_)
+            _tke_passo(k_, eps_, shear_, buoy_, float(dt), float(self.c_mu), k_novo, nu_t)
+            forma = campos[0].shape
+            return k_novo.reshape(forma), nu_t.reshape(forma)
+        
         with np.errstate(divide='ignore', invalid='ignore'):
             nu_t = self.c_mu * (k**2) / eps
             nu_t = np.nan_to_num(nu_t, nan=0.1) # Segurança
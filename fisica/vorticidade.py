@@ -1,12 +1,13 @@
 import numpy as np
+from fisica.adveccao_termica import derivada_centrada
 
 def calcular_vorticidade_relativa(u, v, dx, dy):
     """
     Calcula a vorticidade relativa (zeta).
     zeta = dv/dx - du/dy
     """
-    dv_dx = np.gradient(v, dx, axis=1)
-    du_dy = np.gradient(u, dy, axis=0)
+    dv_dx = derivada_centrada(v, dx, eixo=1)
+    du_dy = derivada_centrada(u, dy, eixo=0)
     
     zeta = dv_dx - du_dy
     return zeta
@@ -15,8 +16,8 @@ def adveccao_vorticidade(zeta, u, v, dx, dy):
     """
     Calcula a advecção de vorticidade: - (u * dZeta/dx + v * dZeta/dy)
     """
-    dzeta_dx = np.gradient(zeta, dx, axis=1)
-    dzeta_dy = np.gradient(zeta, dy, axis=0)
+    dzeta_dx = derivada_centrada(zeta, dx, eixo=1)
+    dzeta_dy = derivada_centrada(zeta, dy, eixo=0)
     
     adv = - (u * dzeta_dx + v * dzeta_dy)
     return adv
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE HIDROLOGIA E ENERGIA: AFLUÊNCIA DE RESERVATÓRIOS
@@ -20,6 +21,36 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@njit(cache=True)
+def _simular_sma(chuva, evap, s_max, s0, k_base, area):
+    """
+    Laço compilado equivalente a chamar passo_tempo dia a dia.
+    Retorna (vazões m³/s, armazenamento do solo em mm após cada dia).
+    """
+    n = chuva.size
+    vazoes = np.empty(n)
+    solo = np.empty(n)
+    fator_conv = (area * 1000) / 86400.0
+    s = s0
+    for i in range(n):
+        entrada_liquida = chuva[i] - evap[i]
+        escoamento_sup = 0.0
+        if entrada_liquida > 0:
+            if s + entrada_liquida > s_max:
+                escoamento_sup = (s + entrada_liquida) - s_max
+                s = s_max
+            else:
+                fator_sat = (s / s_max) ** 2
+                escoamento_sup = entrada_liquida * fator_sat
+                s += entrada_liquida * (1 - fator_sat)
+        else:
+            s = max(0.0, s + entrada_liquida)
+        fluxo_base_mm = s * k_base
+        s -= fluxo_base_mm
+        vazoes[i] = (escoamento_sup + fluxo_base_mm) * fator_conv
+        solo[i] = s
+    return vazoes, solo
+
 class ModeloChuvaVazaoReservatorio:
     def __init__(self, area_bacia_km2=1000, capacidade_solo_mm=100):
         self.area = area_bacia_km2
@@ -73,16 +104,17 @@ class ModeloChuvaVazaoReservatorio:
         return q_total, self.s_atual
 
     def simular_serie(self, serie_chuva, serie_evap):
-        """Roda para uma série temporal inteira."""
-        vazoes = []
-        niveis_solo = []
-        
-        for p, e in zip(serie_chuva, serie_evap):
-            q, s = self.passo_tempo(p, e)
-            vazoes.append(q)
-            niveis_solo.append(s)
+        """Roda para uma série temporal inteira (laço compilado)."""
+        chuva = np.asarray(serie_chuva, dtype=np.float64)
+        evap = np.asarray(serie_evap, dtype=np.float64)
+        n = min(chuva.size, evap.size) # como o zip
+        vazoes, niveis_solo = _simular_sma(chuva[:n], evap[:n], float(self.s_max),
+                                           float(self.s_atual), float(self.k_base),
+                                           float(self.area))
+        if n:
+            self.s_atual = niveis_solo[-1]
             
-        return np.array(vazoes), np.array(niveis_solo)
+        return vazoes, niveis_solo
 
 # ==============================================================================
 # SELF-TEST
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE HIDROLOGIA: BALANÇO HÍDRICO CLIMATOLÓGICO (THORNTHWAITE-MATHER)
@@ -14,6 +15,34 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@njit(cache=True)
+def _balanco_core(P, ETP, cad):
+    """
+    Balanço sequencial mês a mês (modelo "balde" linear), compilado.
+    Retorna (ETR, DEF, EXC).
+    """
+    n = P.size
+    etr = np.empty(n)
+    defic = np.empty(n)
+    exc = np.empty(n)
+    arm = cad # Solo cheio no início
+    for t in range(n):
+        p_et = P[t] - ETP[t]
+        if p_et >= 0:
+            # Sobra água
+            etr[t] = ETP[t]
+            exc[t] = max(0.0, (arm + p_et) - cad)
+            defic[t] = 0.0
+            arm = min(cad, arm + p_et)
+        else:
+            # Falta água: retirada linear do solo
+            retirada = min(arm, -p_et)
+            arm -= retirada
+            etr[t] = P[t] + retirada
+            defic[t] = ETP[t] - etr[t]
+            exc[t] = 0.0
+    return etr, defic, exc
+
 class BalancoHidricoThornthwaite:
     def __init__(self, cad=100.0):
         self.cad = cad # Capacidade de Água Disponível (mm)
@@ -25,58 +54,29 @@ class BalancoHidricoThornthwaite:
         """
         n = len(precips)
         # 1. Calcular ETP (Thornthwaite, 1948) baseada em Temp
+        # Temperaturas convertidas uma única vez para float64
+        T = np.asarray(temps, dtype=np.float64)
         # Índice de Calor Anual I
-        i_mensal = (np.array(temps) / 5.0) ** 1.514
-        I = np.sum(i_mensal) # Supõe que a série é de 1 ano ou média (simplificação)
+        i_mensal = (T / 5.0) ** 1.514
+        I = i_mensal.sum() # Supõe que a série é de 1 ano ou média (simplificação)
         
-        # Expoente a
-        a = 6.75e-7 * I**3 - 7.71e-5 * I**2 + 1.792e-2 * I + 0.49239
+        # Expoente a (polinômio cúbico em I na forma de Horner)
+        a = ((6.75e-7 * I - 7.71e-5) * I + 1.792e-2) * I + 0.49239
         
-        etp_nao_corr = 16.0 * (10 * np.array(temps) / I) ** a
+        etp_nao_corr = 16.0 * (10.0 * T / I) ** a
         
         # Correção por fotoperíodo (latitude) - Ignorado na versão simplificada
         etp = etp_nao_corr # Assumindo 12h sol (equador ou média)
         
-        # 2. Balanço Sequencial
-        arm = self.cad # Solo cheio no início
-        lista_etr = []
-        lista_def = []
-        lista_exc = []
-        
-        for p, et_pot in zip(precips, etp):
-            p_et = p - et_pot
-            neg_acum = 0
-            
-            alt_arm = 0
-            novo_arm = arm
-            etr = 0
-            exc = 0
-            defic = 0
-            
-            if p_et >= 0:
-                # Sobra água
-                novo_arm = min(self.cad, arm + p_et)
-                etr = et_pot
-                exc = max(0, (arm + p_et) - self.cad)
-                defic = 0
-            else:
-                # Falta água (retira do solo exponencialmente)
-                # Modelo de decaimento ARM = CAD * exp(Acc_Neg / CAD) - Complexo
-                # Usar simplificado linear "Balde"
-                retirada = min(arm, abs(p_et))
-                novo_arm = arm - retirada
-                etr = p + retirada
-                defic = et_pot - etr
-                exc = 0
-                
-            arm = novo_arm
-            lista_etr.append(etr)
-            lista_def.append(defic)
-            lista_exc.append(exc)
+        # 2. Balanço Sequencial (laço compilado)
+        # Modelo de decaimento ARM = CAD * exp(Acc_Neg / CAD) - Complexo
+        # Usar simplificado linear "Balde"
+        etr, defic, exc = _balanco_core(np.asarray(precips, dtype=np.float64),
+                                       etp, float(self.cad))
             
         return pd.DataFrame({
-            'P': precips, 'T': temps, 'ETP': etp, 'ETR': lista_etr,
-            'DEF': lista_def, 'EXC': lista_exc
+            'P': precips, 'T': temps, 'ETP': etp, 'ETR': etr,
+            'DEF': defic, 'EXC': exc
         })
 
 # ==============================================================================
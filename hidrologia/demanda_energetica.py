@@ -19,29 +19,39 @@ class ModeloDemandaEnergia:
     def __init__(self, carga_base_mw=5000):
         self.carga_base = carga_base_mw
         
+        # Perfil horário tabelado para horas inteiras (0-23): uma leitura de
+        # tabela no lugar de sin + quadrado a cada chamada
+        h = np.arange(24)
+        self._perfil_hora = 0.7 + 0.6 * np.sin((h - 9) * np.pi / 12)**2
+        
     def prever_demanda(self, temperatura, hora_dia):
         """
         Retorna Demanda em MW.
         Considera T e ciclo diário (horário de pico).
         """
+        # Aceita escalares ou arrays com broadcast (ex.: T[:, None] x hora[None, :]
+        # gera o mapa temperatura x hora numa chamada); ramos viram np.maximum
+        T = np.asarray(temperatura, dtype=np.float64)
+        
         # 1. Componente Climática (U-shape)
         # Fator Frio: T < 18 (Sobe quadraticamente)
-        fator_frio = 0.0
-        if temperatura < 18:
-            fator_frio = 20 * (18 - temperatura)**1.5
+        fator_frio = 20 * np.maximum(18 - T, 0.0)**1.5
             
         # Fator Calor: T > 24 (Sobe exponencialmente/quadrático)
-        fator_calor = 0.0
-        if temperatura > 24:
-            fator_calor = 30 * (temperatura - 24)**1.6
+        fator_calor = 30 * np.maximum(T - 24, 0.0)**1.6
             
         impacto_clima = fator_frio + fator_calor
         
         # 2. Componente Horária (Ciclo humano)
         # Pico as 19h, Vale as 4h
-        fator_hora = np.sin((hora_dia - 9) * np.pi / 12)**2 
-        # Ajuste para ter vale ~0.6 da base e pico ~1.4
-        perfil_hora = 0.7 + 0.6 * fator_hora 
+        hora = np.asarray(hora_dia)
+        if np.issubdtype(hora.dtype, np.integer):
+            perfil_hora = self._perfil_hora[hora % 24]
+        else:
+            # Horas fracionárias: avalia o seno
+            fator_hora = np.sin((hora - 9) * np.pi / 12)**2 
+            # Ajuste para ter vale ~0.6 da base e pico ~1.4
+            perfil_hora = 0.7 + 0.6 * fator_hora 
         
         demanda_total = (self.carga_base + impacto_clima) * perfil_hora
         return demanda_total
@@ -56,7 +66,7 @@ if __name__ == "__main__":
     
     # Varrer faixa de temperatura
     temps = np.linspace(-5, 40, 50)
-    demandas = [modelo.prever_demanda(t, hora_dia=19) for t in temps] # Pico
+    demandas = modelo.prever_demanda(temps, hora_dia=19) # Pico
     
     plt.figure(figsize=(8, 5))
     plt.plot(temps, demandas, 'r-', linewidth=2)
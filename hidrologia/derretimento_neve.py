@@ -1,4 +1,5 @@
 import numpy as np
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE HIDROLOGIA E CRIOSFERA: DERRETIMENTO DE NEVE (DEGREE-DAY)
@@ -8,11 +9,31 @@ Estimativa de derretimento de neve acumulada nas serras (RS/SC) baseada na
 temperatura do ar acima de um limiar (Degree-Day Factor).
 
 Melt = DDF * (Temp - T_base)
+Fração de neve: 1 abaixo de 0 °C, 0 acima de 2 °C, linear entre os dois.
 
 AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@njit(cache=True)
+def _neve_core(T, P, t_base, ddf):
+    """
+    Laço compilado equivalente a chamar passo_tempo dia a dia a partir de
+    estoque zero. Retorna (estoque de neve, degelo) após cada dia, em mm.
+    """
+    n = T.size
+    estoque = np.empty(n)
+    degelo = np.empty(n)
+    e = 0.0
+    for i in range(n):
+        fracao_neve = min(1.0, max(0.0, (2.0 - T[i]) / 2.0))
+        e += fracao_neve * P[i]
+        d = min(e, ddf * max(T[i] - t_base, 0.0))
+        e -= d
+        estoque[i] = e
+        degelo[i] = d
+    return estoque, degelo
+
 class ModeloNeve:
     def __init__(self):
         self.t_base = 0.0 # Temperatura crítica de derretimento (°C)
@@ -24,25 +45,20 @@ class ModeloNeve:
         precipitacao_mm: Total (chuva + neve).
         temperatura_media: °C.
         """
-        novo_estoque = estoque_neve_mm
-        precip_solida = 0.0
-        precip_liquida = 0.0
-        derretimento = 0.0
-        
         # 1. Partição da Precipitação (Chuva vs Neve)
-        if temperatura_media <= 1.0: # Limiar aproximado neve/chuva
-            precip_solida = precipitacao_mm
-            novo_estoque += precip_solida
-        else:
-            precip_liquida = precipitacao_mm
+        # Rampa linear (convenção dos modelos degree-day): só neve até 0 °C,
+        # só chuva a partir de 2 °C. Sem ramos, vale também para arrays.
+        fracao_neve = np.clip((2.0 - temperatura_media) / 2.0, 0.0, 1.0)
+        precip_solida = fracao_neve * precipitacao_mm
+        precip_liquida = (1.0 - fracao_neve) * precipitacao_mm
+        novo_estoque = estoque_neve_mm + precip_solida
             
         # 2. Derretimento (Ablação)
-        if temperatura_media > self.t_base:
-            potencial_derretimento = self.ddf * (temperatura_media - self.t_base)
-            
-            # Não pode derreter mais do que tem
-            derretimento = min(novo_estoque, potencial_derretimento)
-            novo_estoque -= derretimento
+        potencial_derretimento = self.ddf * np.maximum(temperatura_media - self.t_base, 0.0)
+        
+        # Não pode derreter mais do que tem
+        derretimento = np.minimum(novo_estoque, potencial_derretimento)
+        novo_estoque = novo_estoque - derretimento
             
         # Água total disponível no solo (Chuva + Degelo)
         agua_para_hidrologia = precip_liquida + derretimento
@@ -51,14 +67,10 @@ class ModeloNeve:
 
     def simular_evento_frio(self, temps, precips):
         """Simula uma onda de frio com neve posterior aquecimento."""
-        estoque = 0.0
-        hist_estoque = []
-        hist_degelo = []
-        
-        for t, p in zip(temps, precips):
-            estoque, degelo, _ = self.passo_tempo(estoque, p, t)
-            hist_estoque.append(estoque)
-            hist_degelo.append(degelo)
+        T = np.asarray(temps, dtype=np.float64)
+        P = np.asarray(precips, dtype=np.float64)
+        n = min(T.size, P.size) # como o zip
+        hist_estoque, hist_degelo = _neve_core(T[:n], P[:n], float(self.t_base), float(self.ddf))
             
         return hist_estoque, hist_degelo
 
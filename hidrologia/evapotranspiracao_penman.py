@@ -17,13 +17,21 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+# Constantes FAO-56 (float de módulo: avaliadas uma vez, sem conversões por chamada)
+T_REF_PRESSAO = 293.0     # K, atmosfera padrão na correção de altitude
+EXPOENTE_PRESSAO = 5.26
+COEF_RADIACAO = 0.408     # MJ/m²/dia -> mm/dia
+COEF_AERODINAMICO = 900.0 # grama de referência, passo diário
+KELVIN_FAO = 273.0
+COEF_VENTO_DEN = 0.34     # resistência de superfície / aerodinâmica
+
 class ModeloPenmanMonteith:
     def __init__(self, latitude_graus=-30.0, altitude_m=100.0):
         self.lat = np.radians(latitude_graus)
         self.z = altitude_m
         
         # Pressão atmosférica local (kPa)
-        self.P = 101.3 * ((293 - 0.0065 * self.z) / 293) ** 5.26
+        self.P = 101.3 * ((T_REF_PRESSAO - 0.0065 * self.z) / T_REF_PRESSAO) ** EXPOENTE_PRESSAO
         
         # Constante psicrométrica (gamma) ~ 0.063 kPa/°C
         self.gamma = 0.665e-3 * self.P
@@ -40,7 +48,12 @@ class ModeloPenmanMonteith:
     def calcular_eto_diario(self, t_min, t_max, ur_media, vento_2m, radiacao_solar_mj_m2):
         """
         Calcula ETo (mm/dia) para grama de referência.
+        Aceita escalares ou arrays (grade e/ou série diária) com broadcast:
+        todas as operações são ufuncs, então uma chamada cobre o campo inteiro.
         """
+        t_min = np.asarray(t_min, dtype=np.float64)
+        t_max = np.asarray(t_max, dtype=np.float64)
+        
         t_media = (t_max + t_min) / 2.0
         
         # 1. Termo de Radiação
@@ -64,15 +77,15 @@ class ModeloPenmanMonteith:
         dpv = es - ea
         
         # Numerador
-        num_rad = 0.408 * delta * max(0, rn)
-        num_aero = self.gamma * (900 / (t_media + 273)) * vento_2m * dpv
+        num_rad = COEF_RADIACAO * delta * np.maximum(rn, 0.0)
+        num_aero = self.gamma * (COEF_AERODINAMICO / (t_media + KELVIN_FAO)) * vento_2m * dpv
         
         # Denominador
-        den = delta + self.gamma * (1 + 0.34 * vento_2m)
+        den = delta + self.gamma * (1 + COEF_VENTO_DEN * vento_2m)
         
         eto = (num_rad + num_aero) / den
         
-        return max(0, eto) # Não pode ser negativo
+        return np.maximum(eto, 0.0) # Não pode ser negativo
 
 # ==============================================================================
 # SELF-TEST
@@ -82,14 +95,10 @@ if __name__ == "__main__":
     
     pm = ModeloPenmanMonteith(latitude_graus=-30, altitude_m=10)
     
-    # Dia de Verão Quente e Seco
-    eto_verao = pm.calcular_eto_diario(
-        t_min=22, t_max=35, ur_media=40, vento_2m=3.5, radiacao_solar_mj_m2=28
-    )
-    
-    # Dia de Inverno Frio e Úmido
-    eto_inverno = pm.calcular_eto_diario(
-        t_min=5, t_max=15, ur_media=85, vento_2m=1.0, radiacao_solar_mj_m2=10
+    # Dia de Verão Quente e Seco e Dia de Inverno Frio e Úmido, numa chamada
+    eto_verao, eto_inverno = pm.calcular_eto_diario(
+        t_min=np.array([22, 5]), t_max=np.array([35, 15]), ur_media=np.array([40, 85]),
+        vento_2m=np.array([3.5, 1.0]), radiacao_solar_mj_m2=np.array([28, 10])
     )
     
     print(f"ETo Verão (Esperado > 6mm): {eto_verao:.2f} mm/dia")
@@ -46,17 +46,35 @@ class ModeloFluxoSubterraneo:
         Q: Vazão bombeada
         h0: Nível original
         r0: Raio de influência
-        r: Distância do poço
+        r: Distância(s) do poço (escalar ou array: o cone inteiro numa chamada)
         Retorna h(r) -> Nível no ponto r.
         """
         # h(r) = h0 - (Q / (2*pi*T)) * ln(r0/r)
         # T = Transmissividade = K * b
         transmissividade = self.K * 10.0 # Assumindo espessura b=10m fixo aqui para exemplo
         
-        termo = (Q_bombeamento / (2 * np.pi * transmissividade)) * np.log(r0 / r)
+        termo = (Q_bombeamento / (2 * np.pi * transmissividade)) * np.log(r0 / np.asarray(r, dtype=np.float64))
         h_r = h0 - termo
         return h_r
 
+    def rebaixamento_campo_pocos(self, Q_pocos, posicoes_pocos, h0, r0, pontos):
+        """
+        Superposição de Thiem para vários poços bombeando ao mesmo tempo.
+        Q_pocos: (M,) vazões; posicoes_pocos: (M, 2) coordenadas (m);
+        pontos: (N, 2) pontos de observação. Retorna h (N,).
+        As distâncias ponto-poço (N, M) saem de um broadcast e a soma das
+        contribuições é um único produto matriz-vetor.
+        """
+        transmissividade = self.K * 10.0 # mesma espessura b=10m de rebaixamento_poco
+        
+        pontos = np.asarray(pontos, dtype=np.float64)
+        posicoes = np.asarray(posicoes_pocos, dtype=np.float64)
+        dist = np.hypot(pontos[:, None, 0] - posicoes[None, :, 0],
+                        pontos[:, None, 1] - posicoes[None, :, 1])
+        
+        coef = np.asarray(Q_pocos, dtype=np.float64) / (2 * np.pi * transmissividade)
+        return h0 - np.log(r0 / dist) @ coef
+
 # ==============================================================================
 # SELF-TEST
 # ==============================================================================
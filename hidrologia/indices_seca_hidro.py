@@ -1,5 +1,6 @@
 import numpy as np
 import scipy.stats as stats
+from scipy.special import gammainc, ndtri
 
 """
 MÓDULO DE HIDROLOGIA: ÍNDICES DE SECA HIDROLÓGICA (SRI)
@@ -14,39 +15,64 @@ DATA: 2024
 """
 
 class IndicesSecaHidro:
+    # Limiares do SRI: o lado seco fecha à direita (-1.0 já é seca moderada),
+    # o lado úmido fecha à esquerda (1.0 já é moderadamente úmido)
+    _LIMIARES_SECO = np.array([-2.0, -1.5, -1.0])
+    _LIMIARES_UMIDO = np.array([1.0, 1.5, 2.0])
+    _CLASSES = np.array(["Seca Extrema", "Seca Severa", "Seca Moderada", "Normal",
+                         "Moderadamente Úmido", "Muito Úmido", "Extremamente Úmido"])
+    
     def __init__(self):
-        pass
+        self._params_gamma = None # (alpha, loc, beta) do último ajuste
         
-    def calcular_sri(self, serie_vazoes_mensais):
+    @staticmethod
+    def _vazoes_validas(serie_vazoes_mensais):
+        # Filtrar zeros (Gamma nao aceita 0): uma única alocação, sem mutar a entrada
+        vazoes = np.asarray(serie_vazoes_mensais, dtype=np.float64)
+        return np.where(vazoes <= 0, 0.01, vazoes) # Pequeno epsilon
+
+    def ajustar(self, serie_vazoes_mensais):
         """
-        Calcula SRI ajustando uma distribuição Gamma ou Log-Normal à série
-        e convertendo para Normal Padrão (Z-score).
+        Ajusta a Gamma (MLE, a etapa cara) à série de referência e guarda os
+        parâmetros, para transformar várias séries/janelas sem reajustar.
         """
-        # Filtrar zeros (Gamma nao aceita 0)
-        vazoes_validas = np.array(serie_vazoes_mensais)
-        vazoes_validas[vazoes_validas <= 0] = 0.01 # Pequeno epsilon
-        
-        # Ajuste Gamma (padrão)
-        fit_alpha, fit_loc, fit_beta = stats.gamma.fit(vazoes_validas)
-        
-        # Calcular Probabilidade Acumulada (CDF)
-        cdf = stats.gamma.cdf(vazoes_validas, fit_alpha, loc=fit_loc, scale=fit_beta)
+        self._params_gamma = stats.gamma.fit(self._vazoes_validas(serie_vazoes_mensais))
+        return self
+
+    def transformar(self, serie_vazoes_mensais):
+        """Converte vazões em SRI com a Gamma já ajustada (ver ajustar)."""
+        if self._params_gamma is None:
+            raise RuntimeError("Distribuição não ajustada: chame ajustar() antes.")
+        fit_alpha, fit_loc, fit_beta = self._params_gamma
         
-        # Converter para Z-score (Inverse Normal CDF)
-        sri = stats.norm.ppf(cdf)
+        # Calcular Probabilidade Acumulada (CDF): gamma.cdf direto pela função
+        # gama incompleta regularizada, sem o invólucro rv_continuous
+        x = (self._vazoes_validas(serie_vazoes_mensais) - fit_loc) / fit_beta
+        cdf = gammainc(fit_alpha, np.maximum(x, 0.0))
         
-        # Tratar infs possíveis nos extremos
-        sri = np.nan_to_num(sri, nan=0.0)
+        # Converter para Z-score (Inverse Normal CDF); o corte da CDF evita os
+        # infinitos nos extremos (|SRI| <= 4.75)
+        sri = ndtri(np.clip(cdf, 1e-6, 1 - 1e-6))
         return sri
 
+    def calcular_sri(self, serie_vazoes_mensais):
+        """
+        Calcula SRI ajustando uma distribuição Gamma ou Log-Normal à série
+        e convertendo para Normal Padrão (Z-score).
+        """
+        return self.ajustar(serie_vazoes_mensais).transformar(serie_vazoes_mensais)
+
     def classificar_sri(self, valor_sri):
-        if valor_sri >= 2.0: return "Extremamente Úmido"
-        if valor_sri >= 1.5: return "Muito Úmido"
-        if valor_sri >= 1.0: return "Moderadamente Úmido"
-        if valor_sri > -1.0: return "Normal"
-        if valor_sri > -1.5: return "Seca Moderada"
-        if valor_sri > -2.0: return "Seca Severa"
-        return "Seca Extrema"
+        """
+        Classe de seca/umidade do SRI. Aceita escalar (retorna str) ou array
+        (retorna array de rótulos), numa passada de np.digitize por lado.
+        """
+        sri = np.asarray(valor_sri, dtype=np.float64)
+        idx = np.digitize(sri, self._LIMIARES_SECO, right=True) + \
+              np.digitize(sri, self._LIMIARES_UMIDO)
+        idx = np.where(np.isnan(sri), 0, idx) # NaN: nenhuma comparação vale
+        rotulos = self._CLASSES[idx]
+        return str(rotulos) if rotulos.ndim == 0 else rotulos
 
 # ==============================================================================
 # SELF-TEST
@@ -1,4 +1,6 @@
 import numpy as np
+from scipy.signal import lfilter, lfiltic
+from nucleo.aceleracao import njit
 
 """
 MÓDULO DE HIDROLOGIA: ROTEAMENTO DE RIOS (MÉTODO DE MUSKINGUM)
@@ -17,6 +19,17 @@ AUTOR: Luiz Tiago Wilcke
 DATA: 2024
 """
 
+@njit(cache=True)
+def _muskingum_laco(entrada, c0, c1, c2):
+    """Recorrência com o corte em zero aplicado a cada passo (realimentado)."""
+    n = entrada.size
+    outflow = np.zeros(n)
+    outflow[0] = entrada[0]
+    for t in range(1, n):
+        O2 = c0 * entrada[t] + c1 * entrada[t-1] + c2 * outflow[t-1]
+        outflow[t] = max(0.0, O2)
+    return outflow
+
 class RoteamentoMuskingum:
     def __init__(self, k_horas=12.0, x_fator=0.2, dt_horas=1.0):
         self.K = k_horas
@@ -38,25 +51,28 @@ class RoteamentoMuskingum:
         # Cheqer soma = 1
         soma = self.C0 + self.C1 + self.C2
         # print(f"Coeficientes: {self.C0:.3f}, {self.C1:.3f}, {self.C2:.3f} (Soma={soma:.3f})")
+        
+        # O2 = C0*I2 + C1*I1 + C2*O1 é um filtro IIR de 1ª ordem: b/a do lfilter
+        self._b = np.array([self.C0, self.C1])
+        self._a = np.array([1.0, -self.C2])
 
     def propagar_onda(self, hydrograma_entrada):
         """
         Recebe lista/array de vazões de entrada I(t).
         Retorna O(t).
         """
-        n = len(hydrograma_entrada)
-        outflow = np.zeros(n)
+        entrada = np.asarray(hydrograma_entrada, dtype=np.float64)
         
-        # Condição inicial: O[0] = I[0] (Fluxo estável inicial)
-        outflow[0] = hydrograma_entrada[0]
+        # Condição inicial: O[0] = I[0] (Fluxo estável inicial), passada ao
+        # filtro como estado inicial; a recorrência roda no laço C do lfilter
+        zi = lfiltic(self._b, self._a, y=entrada[:1], x=entrada[:1])
+        saida, _ = lfilter(self._b, self._a, entrada[1:], zi=zi)
+        outflow = np.concatenate((entrada[:1], saida))
         
-        for t in range(1, n):
-            I2 = hydrograma_entrada[t]
-            I1 = hydrograma_entrada[t-1]
-            O1 = outflow[t-1]
-            
-            O2 = self.C0 * I2 + self.C1 * I1 + self.C2 * O1
-            outflow[t] = max(0, O2)
+        # O corte max(0, O2) realimenta a recorrência: se alguma vazão ficou
+        # negativa (C0 < 0 numa subida brusca), refaz com o corte passo a passo
+        if (saida < 0).any():
+            outflow = _muskingum_laco(entrada, self.C0, self.C1, self.C2)
             
         return outflow
 
@@ -0,0 +1,76 @@
+"""
+MÓDULO DE ACELERAÇÃO (COMPILAÇÃO JIT OPCIONAL)
+==============================================
+
+Centraliza o uso do Numba pelos modelos. Recorrências sequenciais
+(acumuladores diários, integradores no tempo) não vetorizam em NumPy;
+compiladas com @njit o laço roda em código de máquina.
+
+O Numba é opcional: se não estiver instalado, `njit` devolve a própria
+função e `prange` vira `range`, de modo que os kernels continuam corretos
+(apenas mais lentos) em Python puro. `guvectorize` cai num np.vectorize
+com a mesma assinatura de núcleo (a saída é alocada e passada ao kernel).
+
+O numexpr (expressões fundidas, multi-núcleo) também é opcional: `numexpr`
+fica None quando ausente e os modelos caem no caminho NumPy.
+
+Idem para o CuPy (GPU): `modulo_array` devolve cupy quando os dados já estão
+na GPU e numpy caso contrário, para os modelos despacharem host/GPU.
+
+AUTOR: Luiz Tiago Wilcke
+DATA: 2024
+"""
+
+import re
+import numpy as np
+
+try:
+    from numba import njit, prange, guvectorize
+    NUMBA_DISPONIVEL = True
+except ImportError:
+    NUMBA_DISPONIVEL = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Substituto sem efeito para numba.njit (com ou sem argumentos)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda funcao: funcao
+
+    def guvectorize(tipos, layout, **kwargs):
+        """
+        Substituto para numba.guvectorize com uma única saída: o kernel (que
+        escreve no último argumento) vira um np.vectorize com a assinatura
+        `layout`, ex. '(n,p),(n)->(p)'.
+        """
+        entradas, saida = layout.split('->')
+        dims_entradas = [[d.strip() for d in grupo.split(',') if d.strip()]
+                         for grupo in re.findall(r'\(([^)]*)\)', entradas)]
+        dims_saida = [d.strip() for d in saida.strip().strip('()').split(',') if d.strip()]
+
+        def decorador(funcao):
+            def nucleo(*args):
+                tamanhos = {}
+                for dims, arg in zip(dims_entradas, args):
+                    tamanhos.update(zip(dims, np.shape(arg)))
+                out = np.empty([tamanhos[d] for d in dims_saida])
+                funcao(*args, out)
+                return out
+            return np.vectorize(nucleo, signature=layout)
+        return decorador
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+def modulo_array(*arrays):
+    """Retorna o módulo (numpy ou cupy) onde residem os arrays."""
+    if cupy is not None:
+        return cupy.get_array_module(*arrays)
+    return np
@@ -184,10 +184,8 @@ def gerar_graficos_fase2():
     ts = np.linspace(0, 40, 40) # Temp
     hrs = np.arange(24) # Hora
     
-    grid_demanda = np.zeros((len(ts), len(hrs)))
-    for i, t in enumerate(ts):
-        for j, h in enumerate(hrs):
-            grid_demanda[i, j] = mod_demand.prever_demanda(t, h)
+    # Grade temperatura x hora numa única chamada (broadcast)
+    grid_demanda = mod_demand.prever_demanda(ts[:, None], hrs[None, :])
             
     plt.figure(figsize=(8, 6))
     plt.imshow(grid_demanda, aspect='auto', origin='lower', extent=[0, 24, 0, 40], cmap='inferno')